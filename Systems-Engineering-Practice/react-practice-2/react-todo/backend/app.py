@@ -1,22 +1,102 @@
-from flask import Flask, request, jsonify
+import os
+
+from flask import Flask, Response, abort, request, jsonify, stream_with_context
 from flask_cors import CORS
-from todo_model import db, Todo
+from sqlalchemy import delete, insert, select, update
+from todo_model import db, Todo, encode_lines, encode_rows, list_rows, list_statement, row_to_dict
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+STREAM_BATCH_SIZE = 1000
+MAX_BATCH = 1000
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["X-Next-After-Id"])
 
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///todo.db"
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("TODO_DATABASE_URI", "sqlite:///todo.db")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+app.config["TODO_LIST_CACHE_SIZE"] = 0
 
 db.init_app(app)
 
+todos = Todo.__table__
+
 with app.app_context():
     db.create_all()
 
+def page_args():
+    after_id = request.args.get("after_id", 0, type=int)
+    limit = request.args.get("limit", type=int)
+    if limit is not None and limit < 1:
+        limit = None
+    return after_id, limit
+
+
+def stream_todos(after_id, limit):
+    # yield_per fetches STREAM_BATCH_SIZE rows at a time; ordering by the
+    # primary key lets a client resume from the last id it received
+    stmt = list_statement(after_id, limit).execution_options(yield_per=STREAM_BATCH_SIZE)
+    for rows in db.session.execute(stmt).partitions():
+        yield encode_lines(rows)
+
+
+# Encoded pages keyed by (after_id, limit), cleared on every write. The
+# cache lives in this process only, so enable it (TODO_LIST_CACHE_SIZE > 0)
+# only when a single process serves the API. A read that overlaps a
+# write (the generation changed meanwhile) does not store its page.
+list_cache = {}
+list_generation = 0
+
+
+def clear_list_cache():
+    global list_generation
+    list_generation += 1
+    list_cache.clear()
+
+
+def get_page(after_id, limit):
+    key = (after_id, limit)
+    if key in list_cache:
+        return list_cache[key]
+
+    generation = list_generation
+
+    if limit is None:
+        page = (encode_rows(list_rows(after_id)), None)
+    else:
+        rows = list_rows(after_id, limit + 1)
+        next_after_id = rows[limit - 1][0] if len(rows) > limit else None
+        page = (encode_rows(rows[:limit]), next_after_id)
+
+    cache_size = app.config["TODO_LIST_CACHE_SIZE"]
+    if cache_size and generation == list_generation:
+        if len(list_cache) >= cache_size:
+            list_cache.clear()
+        list_cache[key] = page
+
+    return page
+
+
 @app.route("/todos", methods=["GET"])
 def get_todos():
-    todos = Todo.query.all()
-    return jsonify([t.to_dict() for t in todos])
+    after_id, limit = page_args()
+
+    if request.args.get("stream") == "ndjson":
+        return Response(
+            stream_with_context(stream_todos(after_id, limit)),
+            mimetype="application/x-ndjson"
+        )
+
+    # a bare GET /todos keeps returning every todo, as it did before paging
+    if "limit" in request.args or "after_id" in request.args:
+        limit = min(limit or DEFAULT_LIMIT, MAX_LIMIT)
+
+    body, next_after_id = get_page(after_id, limit)
+
+    response = Response(body, mimetype="application/json")
+    if next_after_id is not None:
+        response.headers["X-Next-After-Id"] = str(next_after_id)
+    return response
 
 @app.route("/todos", methods=["POST"])
 def add_todo():
@@ -24,23 +104,129 @@ def add_todo():
     todo = Todo(text=data["text"], done=False)
     db.session.add(todo)
     db.session.commit()
+    clear_list_cache()
     return jsonify(todo.to_dict()), 201
 
+def todo_changes(data):
+    """Validated {text?, done?} changes of a request item; ValueError if invalid."""
+    if not isinstance(data, dict):
+        raise ValueError("Expected an object")
+
+    changes = {}
+    if "text" in data:
+        if not isinstance(data["text"], str):
+            raise ValueError("text must be a string")
+        changes["text"] = data["text"]
+    if "done" in data:
+        if not isinstance(data["done"], bool):
+            raise ValueError("done must be true or false")
+        changes["done"] = data["done"]
+    return changes
+
+
+def todo_id(value):
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError("id must be an integer")
+    return value
+
+
 @app.route("/todos/<int:id>", methods=["PUT"])
 def update_todo(id):
-    todo = Todo.query.get_or_404(id)
-    data = request.json
-    todo.text = data.get("text", todo.text)
-    todo.done = data.get("done", todo.done)
+    # one UPDATE ... RETURNING instead of a read followed by a write
+    try:
+        changes = todo_changes(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    stmt = select(todos)
+    if changes:
+        stmt = update(todos).values(**changes).returning(*todos.c)
+
+    row = db.session.execute(stmt.where(todos.c.id == id)).first()
+    if row is None:
+        abort(404)
+
     db.session.commit()
-    return jsonify(todo.to_dict())
+    clear_list_cache()
+    return jsonify(row_to_dict(row))
 
 @app.route("/todos/<int:id>", methods=["DELETE"])
 def delete_todo(id):
-    todo = Todo.query.get_or_404(id)
-    db.session.delete(todo)
+    row = db.session.execute(delete(todos).where(todos.c.id == id).returning(todos.c.id)).first()
+    if row is None:
+        abort(404)
+
     db.session.commit()
+    clear_list_cache()
     return "", 204
+
+
+@app.route("/todos/batch", methods=["POST"])
+def batch_todos():
+    """Apply {"create": [{text}], "update": [{id, text?, done?}], "delete": [id]}
+    in one transaction.
+
+    Creates are one multi-row INSERT, updates sharing the same changes
+    (e.g. "mark all done") one UPDATE ... WHERE id IN, deletes one
+    DELETE ... WHERE id IN.
+    """
+    data = request.get_json(silent=True)
+
+    try:
+        if not isinstance(data, dict):
+            raise ValueError("Expected an object")
+
+        creates = data.get("create") or []
+        updates = data.get("update") or []
+        deletes = data.get("delete") or []
+        if not all(isinstance(ops, list) for ops in (creates, updates, deletes)):
+            raise ValueError("create, update and delete must be lists")
+
+        if len(creates) + len(updates) + len(deletes) > MAX_BATCH:
+            raise ValueError(f"At most {MAX_BATCH} operations per batch")
+
+        new_rows = []
+        for item in creates:
+            changes = todo_changes(item)
+            if "text" not in changes:
+                raise ValueError("create items need a text")
+            new_rows.append({"text": changes["text"], "done": changes.get("done", False)})
+
+        groups = {}
+        for item in updates:
+            changes = todo_changes(item)
+            id = todo_id(item.get("id"))
+            if changes:
+                groups.setdefault(tuple(sorted(changes.items())), []).append(id)
+
+        delete_ids = [todo_id(id) for id in deletes]
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    created, updated, deleted = [], [], []
+
+    if new_rows:
+        created = db.session.execute(insert(todos).returning(*todos.c), new_rows).all()
+
+    for changes, ids in groups.items():
+        updated += db.session.execute(
+            update(todos).where(todos.c.id.in_(ids)).values(**dict(changes)).returning(*todos.c)
+        ).all()
+
+    if delete_ids:
+        deleted = db.session.execute(
+            delete(todos).where(todos.c.id.in_(delete_ids)).returning(todos.c.id)
+        ).scalars().all()
+
+    db.session.commit()
+    clear_list_cache()
+
+    return jsonify({
+        "created": [row_to_dict(row) for row in created],
+        "updated": [row_to_dict(row) for row in updated],
+        "deleted": deleted
+    })
+
 @app.route("/")
 def home():
     return "Backend is running!"
@@ -0,0 +1,76 @@
+"""Micro-benchmark: ORM listing (Todo.query.all() + to_dict) vs the Core
+tuple path (list_rows + encode_rows) used by GET /todos.
+
+    python bench_list_todos.py                  # 10k, 100k and 1M rows
+    python bench_list_todos.py 50000 200000     # custom sizes
+
+Each size gets a fresh SQLite file in a temp directory; the best of
+REPEAT runs is reported.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from flask import Flask, json
+from sqlalchemy import insert
+
+from todo_model import db, Todo, encode_rows, list_rows
+
+SIZES = [10_000, 100_000, 1_000_000]
+REPEAT = 3
+INSERT_BATCH = 50_000
+
+
+def orm_path():
+    return json.dumps([t.to_dict() for t in Todo.query.all()])
+
+
+def core_path():
+    return encode_rows(list_rows())
+
+
+def populate(rows):
+    for start in range(0, rows, INSERT_BATCH):
+        db.session.execute(
+            insert(Todo),
+            [{"text": f"todo {i}", "done": i % 3 == 0} for i in range(start, min(start + INSERT_BATCH, rows))]
+        )
+    db.session.commit()
+
+
+def best_time(fn):
+    best = None
+    for _ in range(REPEAT):
+        db.session.remove()
+        started = time.perf_counter()
+        body = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(body)
+
+
+def run(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(tmp, "bench.db")
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            populate(rows)
+
+            orm_seconds, orm_bytes = best_time(orm_path)
+            core_seconds, core_bytes = best_time(core_path)
+            db.session.remove()
+            db.engine.dispose()
+
+    print(
+        f"{rows:>9} rows  orm {orm_seconds * 1000:9.1f} ms  core {core_seconds * 1000:9.1f} ms"
+        f"  x{orm_seconds / core_seconds:4.1f}  ({orm_bytes} / {core_bytes} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        run(size)
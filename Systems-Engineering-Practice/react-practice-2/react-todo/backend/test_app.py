@@ -0,0 +1,187 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+# point the app at a throwaway database before it creates its tables
+DB_DIR = tempfile.mkdtemp()
+os.environ["TODO_DATABASE_URI"] = "sqlite:///" + os.path.join(DB_DIR, "test.db")
+
+import app as todo_app  # noqa: E402
+from app import app, clear_list_cache, todos  # noqa: E402
+from todo_model import db  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    with app.app_context():
+        db.session.execute(todos.delete())
+        db.session.commit()
+    clear_list_cache()
+    return app.test_client()
+
+
+def add_todos(client, count):
+    return [client.post("/todos", json={"text": f"todo {i}"}).get_json()["id"] for i in range(count)]
+
+
+def test_bare_get_returns_every_todo(client):
+    ids = add_todos(client, 5)
+
+    response = client.get("/todos")
+
+    assert [t["id"] for t in response.get_json()] == ids
+    assert "X-Next-After-Id" not in response.headers
+
+
+def test_pages_follow_the_next_after_id_header(client):
+    ids = add_todos(client, 5)
+
+    seen, after_id = [], 0
+    while after_id is not None:
+        response = client.get("/todos", query_string={"after_id": after_id, "limit": 2})
+        seen += [t["id"] for t in response.get_json()]
+        header = response.headers.get("X-Next-After-Id")
+        after_id = int(header) if header else None
+
+    assert seen == ids
+
+
+def test_last_full_page_has_no_next_cursor(client):
+    ids = add_todos(client, 4)
+
+    response = client.get("/todos", query_string={"after_id": ids[1], "limit": 2})
+
+    assert [t["id"] for t in response.get_json()] == ids[2:]
+    assert "X-Next-After-Id" not in response.headers
+
+
+def test_ndjson_stream_resumes_after_id(client):
+    ids = add_todos(client, 3)
+
+    response = client.get("/todos", query_string={"stream": "ndjson", "after_id": ids[0]})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.mimetype == "application/x-ndjson"
+    assert [t["id"] for t in lines] == ids[1:]
+
+
+@pytest.fixture
+def cached_client(client):
+    app.config["TODO_LIST_CACHE_SIZE"] = 8
+    yield client
+    app.config["TODO_LIST_CACHE_SIZE"] = 0
+    clear_list_cache()
+
+
+def test_listing_rows_are_plain_dicts(client):
+    add_todos(client, 1)
+
+    body = client.get("/todos").get_data(as_text=True)
+
+    assert json.loads(body)[0].keys() == {"id", "text", "done"}
+    assert " " not in body.replace("todo 0", "")
+
+
+def test_cached_page_is_served_until_a_write(cached_client):
+    add_todos(cached_client, 2)
+    first = cached_client.get("/todos", query_string={"limit": 10}).get_json()
+
+    with patch.object(todo_app, "list_rows", side_effect=AssertionError("not cached")):
+        assert cached_client.get("/todos", query_string={"limit": 10}).get_json() == first
+
+    todo_id = first[0]["id"]
+    cached_client.put(f"/todos/{todo_id}", json={"done": True})
+
+    assert cached_client.get("/todos", query_string={"limit": 10}).get_json()[0]["done"] is True
+
+
+def test_page_read_across_a_write_is_not_cached(cached_client):
+    add_todos(cached_client, 2)
+    list_rows = todo_app.list_rows
+
+    def racing_list_rows(*args):
+        rows = list_rows(*args)
+        clear_list_cache()  # a write commits while the page is being built
+        return rows
+
+    with patch.object(todo_app, "list_rows", racing_list_rows):
+        cached_client.get("/todos")
+
+    assert todo_app.list_cache == {}
+
+
+def test_cache_is_disabled_by_default(client):
+    add_todos(client, 1)
+    client.get("/todos")
+
+    assert todo_app.list_cache == {}
+
+
+def test_batch_create_update_delete(client):
+    keep, finish, drop = add_todos(client, 3)
+
+    response = client.post("/todos/batch", json={
+        "create": [{"text": "new a"}, {"text": "new b", "done": True}],
+        "update": [{"id": keep, "text": "renamed"}, {"id": finish, "done": True}],
+        "delete": [drop]
+    })
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert [(t["text"], t["done"]) for t in body["created"]] == [("new a", False), ("new b", True)]
+    assert sorted((t["id"], t["text"], t["done"]) for t in body["updated"]) == [
+        (keep, "renamed", False), (finish, "todo 1", True)
+    ]
+    assert body["deleted"] == [drop]
+
+    listed = {t["id"]: (t["text"], t["done"]) for t in client.get("/todos").get_json()}
+    assert drop not in listed
+    assert listed[keep] == ("renamed", False)
+    assert listed[finish] == ("todo 1", True)
+    assert len(listed) == 4
+
+
+def test_batch_groups_identical_updates(client):
+    ids = add_todos(client, 3)
+
+    body = client.post("/todos/batch", json={
+        "update": [{"id": id, "done": True} for id in ids]
+    }).get_json()
+
+    assert sorted(t["id"] for t in body["updated"]) == ids
+    assert all(t["done"] for t in client.get("/todos").get_json())
+
+
+def test_batch_skips_missing_ids(client):
+    (id,) = add_todos(client, 1)
+
+    body = client.post("/todos/batch", json={
+        "update": [{"id": id + 100, "done": True}],
+        "delete": [id + 100]
+    }).get_json()
+
+    assert body == {"created": [], "updated": [], "deleted": []}
+
+
+@pytest.mark.parametrize("payload", [
+    [],
+    {"create": {"text": "not a list"}},
+    {"create": [{"done": True}]},
+    {"create": [{"text": 1}]},
+    {"update": [{"id": "1", "done": True}]},
+    {"update": [{"id": 1, "done": "yes"}]},
+    {"delete": [True]},
+    {"delete": list(range(todo_app.MAX_BATCH + 1))},
+])
+def test_batch_rejects_bad_input_without_writing(client, payload):
+    (id,) = add_todos(client, 1)
+
+    body = {"create": [{"text": "never stored"}], **payload} if isinstance(payload, dict) else payload
+    response = client.post("/todos/batch", json=body)
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    assert [t["id"] for t in client.get("/todos").get_json()] == [id]
@@ -1,4 +1,7 @@
+import json
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select
 
 db = SQLAlchemy()
 
@@ -13,3 +16,34 @@ class Todo(db.Model):
             "text": self.text,
             "done": self.done
         }
+
+
+# Read-only listing path: plain (id, text, done) rows from a Core select,
+# so no Todo instances are built or added to the session's identity map,
+# encoded in one call by a single reusable encoder.
+LIST_FIELDS = ("id", "text", "done")
+
+list_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def list_statement(after_id=0, limit=None):
+    stmt = select(Todo.id, Todo.text, Todo.done).where(Todo.id > after_id).order_by(Todo.id)
+    if limit:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def list_rows(after_id=0, limit=None):
+    return db.session.execute(list_statement(after_id, limit)).all()
+
+
+def row_to_dict(row):
+    return dict(zip(LIST_FIELDS, row))
+
+
+def encode_rows(rows):
+    return list_encoder.encode([row_to_dict(row) for row in rows])
+
+
+def encode_lines(rows):
+    return "".join(list_encoder.encode(row_to_dict(row)) + "\n" for row in rows)
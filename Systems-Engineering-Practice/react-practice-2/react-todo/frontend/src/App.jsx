@@ -8,11 +8,26 @@ export default function App() {
   const [input, setInput] = useState("");
   const [editingId, setEditingId] = useState(null);
   const [editText, setEditText] = useState("");
+  const [nextAfterId, setNextAfterId] = useState(null);
+
+  function loadTodos(afterId = 0) {
+    fetch(`${API}/todos?limit=100&after_id=${afterId}`)
+      .then(res => {
+        setNextAfterId(res.headers.get("X-Next-After-Id"));
+        return res.json();
+      })
+      .then(data =>
+        setTodos(prev => {
+          if (!afterId) return data;
+          // todos added locally since the last page come back again here
+          const known = new Set(prev.map(t => t.id));
+          return [...prev, ...data.filter(t => !known.has(t.id))];
+        })
+      );
+  }
 
   useEffect(() => {
-    fetch(`${API}/todos`)
-      .then(res => res.json())
-      .then(data => setTodos(data));
+    loadTodos();
   }, []);
 
 async function addTodo() {
@@ -52,6 +67,34 @@ async function addTodo() {
       .then(() => setTodos(prev => prev.filter(t => t.id !== id)));
   }
 
+  function batch(ops) {
+    return fetch(`${API}/todos/batch`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(ops)
+    }).then(res => res.json());
+  }
+
+  function markAllDone() {
+    const open = todos.filter(t => !t.done);
+    if (!open.length) return;
+
+    batch({ update: open.map(t => ({ id: t.id, done: true })) }).then(({ updated }) => {
+      const byId = new Map(updated.map(t => [t.id, t]));
+      setTodos(prev => prev.map(t => byId.get(t.id) ?? t));
+    });
+  }
+
+  function clearCompleted() {
+    const done = todos.filter(t => t.done);
+    if (!done.length) return;
+
+    batch({ delete: done.map(t => t.id) }).then(({ deleted }) => {
+      const removed = new Set(deleted);
+      setTodos(prev => prev.filter(t => !removed.has(t.id)));
+    });
+  }
+
   function saveEdit(id) {
     fetch(`${API}/todos/${id}`, {
       method: "PUT",
@@ -122,6 +165,15 @@ async function addTodo() {
             </li>
           ))}
         </ul>
+
+        <div className="actions">
+          <button onClick={markAllDone}>Mark all done</button>
+          <button className="delete" onClick={clearCompleted}>Clear completed</button>
+        </div>
+
+        {nextAfterId && (
+          <button onClick={() => loadTodos(nextAfterId)}>Load more</button>
+        )}
       </div>
     </div>
   );
@@ -1,18 +1,237 @@
+import csv
+import io
+import itertools
+
 import frappe
+from frappe.utils import add_to_date, cint, getdate, now_datetime, nowdate
+from werkzeug.wrappers import Response
+
+TASK_FIELDS = ["name", "title", "status", "description", "due_date", "priority", "creation"]
+
+
+def _page_length(limit, default=50, maximum=500):
+    return max(1, min(cint(limit) or default, maximum))
+
+
+def _task_filters(status=None, priority=None, due_from=None, due_to=None):
+    conditions = ["`owner` = %(owner)s"]
+    values = {"owner": frappe.session.user}
+
+    if status:
+        conditions.append("`status` = %(status)s")
+        values["status"] = status
+
+    if priority:
+        conditions.append("`priority` = %(priority)s")
+        values["priority"] = priority
+
+    if due_from:
+        conditions.append("`due_date` >= %(due_from)s")
+        values["due_from"] = getdate(due_from)
+
+    if due_to:
+        conditions.append("`due_date` <= %(due_to)s")
+        values["due_to"] = getdate(due_to)
+
+    return conditions, values
+
 
 @frappe.whitelist()
-def get_tasks():
+def get_tasks(cursor=None, limit=50, status=None, priority=None, due_from=None, due_to=None):
+    """One page of the user's tasks, newest first.
+
+    Pages are keyed on (creation, name): pass the returned `next_cursor`
+    back as `cursor` for the next page. Served by the (owner, creation)
+    and (owner, status, creation) indexes from patches/add_task_indexes.py.
+    """
     if frappe.session.user == "Guest":
         frappe.throw("Login required")
 
-    return frappe.db.get_list(
-        "Task",
-        fields=["name", "title", "status", "description", "due_date", "priority"],
-        filters={"owner": frappe.session.user},
-        order_by="creation desc"
+    limit = _page_length(limit)
+    conditions, values = _task_filters(status, priority, due_from, due_to)
+
+    if cursor:
+        creation, _sep, name = cursor.partition("|")
+        if not name:
+            frappe.throw("Invalid cursor")
+
+        conditions.append(
+            "(`creation` < %(creation)s or (`creation` = %(creation)s and `name` < %(name)s))"
+        )
+        values.update({"creation": creation, "name": name})
+
+    tasks = frappe.db.sql(
+        f"""
+        select {", ".join(f"`{f}`" for f in TASK_FIELDS)}
+        from `tabTask`
+        where {" and ".join(conditions)}
+        order by `creation` desc, `name` desc
+        limit {limit + 1}
+        """,
+        values,
+        as_dict=True
+    )
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = f"{tasks[-1].creation}|{tasks[-1].name}"
+
+    result = {"tasks": tasks, "next_cursor": next_cursor}
+
+    if not cursor:
+        # starting point for get_task_changes polling
+        result["sync_cursor"] = _current_sync_cursor(frappe.session.user)
+
+    return result
+
+
+# Delta sync: the cursor is "modified|name|deleted_on|tombstone_id", one
+# keyset position over the user's tasks and one over the tombstones
+# on_task_trash writes for deleted tasks. Tombstones are keyed on the task
+# owner; Deleted Document rows belong to whoever ran the delete.
+#
+# `modified` / `deleted_on` are set before commit, so a late-committing
+# write can land behind a cursor that already moved past it. Each call
+# also re-reads SYNC_OVERLAP_SECONDS behind the cursor and merges those
+# rows in by name.
+
+SYNC_START = "1900-01-01 00:00:00"
+SYNC_OVERLAP_SECONDS = 5
+
+
+def on_task_trash(doc, method=None):
+    """Task on_trash hook (hooks.py doc_events): record a sync tombstone."""
+    frappe.db.sql(
+        """
+        insert into `__task_tombstone` (`task`, `task_owner`, `deleted_on`)
+        values (%s, %s, %s)
+        """,
+        (doc.name, doc.owner, now_datetime())
     )
 
 
+def _current_sync_cursor(owner):
+    task = frappe.db.sql(
+        """
+        select `modified`, `name` from `tabTask`
+        where `owner` = %s
+        order by `modified` desc, `name` desc limit 1
+        """,
+        owner
+    )
+    deleted = frappe.db.sql(
+        """
+        select `deleted_on`, `id` from `__task_tombstone`
+        where `task_owner` = %s
+        order by `deleted_on` desc, `id` desc limit 1
+        """,
+        owner
+    )
+
+    task = task[0] if task else (SYNC_START, "")
+    deleted = deleted[0] if deleted else (SYNC_START, 0)
+
+    return "|".join(str(v) for v in (*task, *deleted))
+
+
+@frappe.whitelist()
+def get_task_changes(since, limit=200):
+    """The user's tasks modified after `since`, plus names of deleted ones.
+
+    Start from the `sync_cursor` returned by the first get_tasks page and
+    pass back the returned `cursor`; call again while `has_more` is set.
+    Rows from just before `since` are sent again, so apply them by name.
+    """
+    if frappe.session.user == "Guest":
+        frappe.throw("Login required")
+
+    limit = _page_length(limit, default=200)
+    parts = (since or "").split("|")
+    if len(parts) != 4:
+        frappe.throw("Invalid cursor")
+
+    modified, name, deleted_on, tombstone_id = parts
+    owner = frappe.session.user
+
+    values = {
+        "owner": owner,
+        "modified": modified,
+        "name": name,
+        "modified_from": add_to_date(modified, seconds=-SYNC_OVERLAP_SECONDS),
+        "deleted_on": deleted_on,
+        "id": cint(tombstone_id),
+        "deleted_from": add_to_date(deleted_on, seconds=-SYNC_OVERLAP_SECONDS)
+    }
+
+    tasks = frappe.db.sql(
+        f"""
+        select {", ".join(f"`{f}`" for f in TASK_FIELDS + ["modified"])}
+        from `tabTask`
+        where `owner` = %(owner)s
+            and (`modified` > %(modified)s or (`modified` = %(modified)s and `name` > %(name)s))
+        order by `modified` asc, `name` asc
+        limit {limit + 1}
+        """,
+        values,
+        as_dict=True
+    )
+
+    # the overlap window behind the cursor, cursor row included
+    recent_tasks = frappe.db.sql(
+        f"""
+        select {", ".join(f"`{f}`" for f in TASK_FIELDS + ["modified"])}
+        from `tabTask`
+        where `owner` = %(owner)s and `modified` >= %(modified_from)s
+            and (`modified` < %(modified)s or (`modified` = %(modified)s and `name` <= %(name)s))
+        order by `modified` asc, `name` asc
+        limit {limit}
+        """,
+        values,
+        as_dict=True
+    )
+
+    deleted = frappe.db.sql(
+        f"""
+        select `id`, `task`, `deleted_on`
+        from `__task_tombstone`
+        where `task_owner` = %(owner)s
+            and (`deleted_on` > %(deleted_on)s or (`deleted_on` = %(deleted_on)s and `id` > %(id)s))
+        order by `deleted_on` asc, `id` asc
+        limit {limit + 1}
+        """,
+        values,
+        as_dict=True
+    )
+
+    recent_deleted = frappe.db.sql_list(
+        f"""
+        select `task`
+        from `__task_tombstone`
+        where `task_owner` = %(owner)s and `deleted_on` >= %(deleted_from)s
+            and (`deleted_on` < %(deleted_on)s or (`deleted_on` = %(deleted_on)s and `id` <= %(id)s))
+        order by `deleted_on` asc, `id` asc
+        limit {limit}
+        """,
+        values
+    )
+
+    has_more = len(tasks) > limit or len(deleted) > limit
+    tasks, deleted = tasks[:limit], deleted[:limit]
+
+    if tasks:
+        modified, name = tasks[-1].modified, tasks[-1].name
+    if deleted:
+        deleted_on, tombstone_id = deleted[-1].deleted_on, deleted[-1].id
+
+    return {
+        "tasks": list({row.name: row for row in [*recent_tasks, *tasks]}.values()),
+        "deleted": list(dict.fromkeys([*recent_deleted, *(row.task for row in deleted)])),
+        "cursor": "|".join(str(v) for v in (modified, name, deleted_on, tombstone_id)),
+        "has_more": has_more
+    }
+
+
 @frappe.whitelist()
 def add_task(title, description=None, due_date=None, priority="Medium"):
     if frappe.session.user == "Guest":
@@ -53,4 +272,184 @@ def delete_task(name):
 
     frappe.delete_doc("Task", name)
 
+
+# Batch mutations: ownership of every name is checked with one query and
+# all items run in the request's single transaction. Each item gets its
+# own savepoint, so a failing item is rolled back and reported without
+# undoing the others.
+
+MAX_BATCH = 500
+BATCH_FIELDS = ("title", "description", "status", "priority", "due_date")
+
+
+def _parse_names(names):
+    names = frappe.parse_json(names) if isinstance(names, str) else names
+    if not isinstance(names, list) or not names:
+        frappe.throw("names must be a non-empty list")
+
+    names = list(dict.fromkeys(str(name) for name in names))
+    if len(names) > MAX_BATCH:
+        frappe.throw(f"At most {MAX_BATCH} tasks per batch")
+
+    return names
+
+
+def _owned_rows(names):
+    """Rows of `names` keyed by name, plus per-name errors for the rest."""
+    rows = {
+        row.name: row
+        for row in frappe.db.sql(
+            "select `name`, `owner` from `tabTask` where `name` in %(names)s",
+            {"names": names},
+            as_dict=True
+        )
+    }
+
+    errors = {}
+    for name in names:
+        if name not in rows:
+            errors[name] = "Not found"
+        elif rows[name].owner != frappe.session.user:
+            errors[name] = "Not permitted"
+
+    return rows, errors
+
+
+def _run_item(name, savepoint, action):
+    frappe.db.savepoint(savepoint)
+    try:
+        action()
+    except Exception as e:
+        frappe.db.rollback(save_point=savepoint)
+        frappe.clear_last_message()
+        return {"name": name, "ok": False, "error": str(e) or type(e).__name__}
+
+    return {"name": name, "ok": True}
+
+
+@frappe.whitelist(methods=["POST"])
+def batch_update_tasks(names, changes):
+    """Apply the same `changes` (title, description, status, priority,
+    due_date) to every task in `names`. Returns one result per name."""
+    if frappe.session.user == "Guest":
+        frappe.throw("Login required")
+
+    names = _parse_names(names)
+    changes = frappe.parse_json(changes) if isinstance(changes, str) else changes
+
+    unknown = set(changes or {}) - set(BATCH_FIELDS)
+    if not changes or unknown:
+        frappe.throw(f"changes may only set: {', '.join(BATCH_FIELDS)}")
+
+    # ownership is checked for all names in one query; each task is then
+    # saved normally so validation, sanitising, hooks and versioning run
+    _rows, errors = _owned_rows(names)
+
+    def update(name):
+        doc = frappe.get_doc("Task", name)
+        doc.update(changes)
+        doc.save()
+
+    results = []
+    for index, name in enumerate(names):
+        if name in errors:
+            results.append({"name": name, "ok": False, "error": errors[name]})
+        else:
+            results.append(_run_item(name, f"batch_update_{index}", lambda: update(name)))
+
+    return results
+
+
+@frappe.whitelist(methods=["POST"])
+def batch_delete_tasks(names):
+    """Delete every task in `names` owned by the user. Returns one result per name."""
+    if frappe.session.user == "Guest":
+        frappe.throw("Login required")
+
+    names = _parse_names(names)
+    _rows, errors = _owned_rows(names)
+
+    results = []
+    for index, name in enumerate(names):
+        if name in errors:
+            results.append({"name": name, "ok": False, "error": errors[name]})
+        else:
+            # delete_doc runs on_trash, which writes the get_task_changes tombstone
+            results.append(_run_item(
+                name, f"batch_delete_{index}", lambda: frappe.delete_doc("Task", name)
+            ))
+
+    return results
+
+
+# Streaming export: the Response wraps a generator that Frappe passes
+# through as a chunked download. It runs after the request context is
+# torn down, so it opens its own site connection and reads rows from an
+# unbuffered cursor EXPORT_CHUNK rows at a time.
+
+EXPORT_CHUNK = 1000
+
+
+def _export_chunks(site, sites_path, user, query, values, file_format):
+    frappe.init(site=site, sites_path=sites_path)
+    try:
+        frappe.connect()
+        frappe.set_user(user)
+
+        if file_format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(TASK_FIELDS)
+            yield buffer.getvalue().encode()
+
+        with frappe.db.unbuffered_cursor():
+            rows = frappe.db.sql(query, values, as_iterator=True)
+            while True:
+                chunk = list(itertools.islice(rows, EXPORT_CHUNK))
+                if not chunk:
+                    break
+
+                if file_format == "csv":
+                    buffer = io.StringIO()
+                    csv.writer(buffer).writerows(chunk)
+                    yield buffer.getvalue().encode()
+                else:
+                    yield "".join(
+                        frappe.as_json(dict(zip(TASK_FIELDS, row)), indent=None) + "\n"
+                        for row in chunk
+                    ).encode()
+    finally:
+        frappe.destroy()
+
+
+@frappe.whitelist()
+def export_tasks(format="csv", status=None, priority=None, due_from=None, due_to=None):
+    """Stream all of the user's tasks (same filters as get_tasks) as CSV or NDJSON."""
+    if frappe.session.user == "Guest":
+        frappe.throw("Login required")
+
+    if format not in ("csv", "ndjson", "jsonl"):
+        frappe.throw("Invalid format (use csv or ndjson)")
+
+    file_format = "csv" if format == "csv" else "ndjson"
+
+    conditions, values = _task_filters(status, priority, due_from, due_to)
+    query = f"""
+        select {", ".join(f"`{f}`" for f in TASK_FIELDS)}
+        from `tabTask`
+        where {" and ".join(conditions)}
+        order by `creation` desc, `name` desc
+    """
+
+    response = Response(
+        _export_chunks(
+            frappe.local.site, frappe.local.sites_path, frappe.session.user,
+            query, values, file_format
+        ),
+        content_type="text/csv; charset=utf-8" if file_format == "csv" else "application/x-ndjson; charset=utf-8",
+        direct_passthrough=True
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="tasks-{nowdate()}.{file_format}"'
+
+    return response
+
 ## CHANGED FOR NEW TASK @MONDAY 26-01-2026
\ No newline at end of file
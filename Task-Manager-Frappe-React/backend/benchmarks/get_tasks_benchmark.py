@@ -0,0 +1,97 @@
+"""Latency of api.get_tasks for one owner with many tasks.
+
+Run on a development site only (it inserts and then deletes rows):
+
+    bench --site <site> execute task_manager.benchmarks.get_tasks_benchmark.run \
+        --kwargs "{'rows': 100000}"
+"""
+
+import time
+
+import frappe
+from frappe.utils import add_days, add_to_date, now_datetime, nowdate
+
+from task_manager import api
+
+BENCH_USER = "get-tasks-benchmark@example.com"
+STATUSES = ["Open", "Working", "Completed"]
+PRIORITIES = ["High", "Medium", "Low"]
+
+
+def _ensure_user():
+    if not frappe.db.exists("User", BENCH_USER):
+        frappe.get_doc({
+            "doctype": "User",
+            "email": BENCH_USER,
+            "first_name": "Benchmark",
+            "send_welcome_email": 0
+        }).insert(ignore_permissions=True)
+
+
+def _seed(rows, chunk=10000):
+    start = now_datetime()
+    for offset in range(0, rows, chunk):
+        values = []
+        for i in range(offset, min(offset + chunk, rows)):
+            created = add_to_date(start, seconds=-i)
+            values.append((
+                f"BENCH-{i:08d}", f"Benchmark task {i}", STATUSES[i % 3], PRIORITIES[i % 3],
+                add_days(nowdate(), i % 365), created, created, BENCH_USER, BENCH_USER
+            ))
+
+        frappe.db.bulk_insert(
+            "Task",
+            fields=[
+                "name", "title", "status", "priority", "due_date",
+                "creation", "modified", "owner", "modified_by"
+            ],
+            values=values
+        )
+        frappe.db.commit()
+
+
+def _time(label, fn, repeat=20):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    print(f"{label:<40} {elapsed:8.2f} ms  ({len(result['tasks'])} rows)")
+    return result
+
+
+def run(rows=100000, keep=False):
+    _ensure_user()
+    frappe.db.delete("Task", {"owner": BENCH_USER})
+    _seed(int(rows))
+
+    frappe.set_user(BENCH_USER)
+    try:
+        print(f"get_tasks with {rows} tasks for one owner")
+
+        first = _time("first page (50)", lambda: api.get_tasks())
+
+        cursor = first["next_cursor"]
+        for _ in range(100):
+            cursor = api.get_tasks(cursor=cursor)["next_cursor"]
+        _time("page 101 via cursor", lambda: api.get_tasks(cursor=cursor))
+
+        _time("status=Completed", lambda: api.get_tasks(status="Completed"))
+        _time("priority=High, due in 30 days", lambda: api.get_tasks(
+            priority="High", due_from=nowdate(), due_to=add_days(nowdate(), 30)
+        ))
+
+        def old_full_list():
+            return {"tasks": frappe.db.get_list(
+                "Task",
+                fields=["name", "title", "status", "description", "due_date", "priority"],
+                filters={"owner": BENCH_USER},
+                order_by="creation desc"
+            )}
+
+        _time("previous unpaginated get_tasks", old_full_list, repeat=3)
+    finally:
+        frappe.set_user("Administrator")
+        if not keep:
+            frappe.db.delete("Task", {"owner": BENCH_USER})
+            frappe.db.commit()
@@ -0,0 +1,9 @@
+import frappe
+
+
+def execute():
+    # get_tasks: owner = ? order by creation desc, name desc
+    frappe.db.add_index("Task", ["owner", "creation"], "owner_creation_index")
+
+    # get_tasks(status=...): the (owner, status) prefix also serves plain status filters
+    frappe.db.add_index("Task", ["owner", "status", "creation"], "owner_status_creation_index")
@@ -0,0 +1,6 @@
+import frappe
+
+
+def execute():
+    # get_task_changes: owner = ? and (modified, name) > cursor
+    frappe.db.add_index("Task", ["owner", "modified"], "owner_modified_index")
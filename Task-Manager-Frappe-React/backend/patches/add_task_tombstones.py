@@ -0,0 +1,17 @@
+import frappe
+
+
+def execute():
+    # get_task_changes: deleted tasks per task owner. Deleted Document rows
+    # are owned by whoever deleted the task, so they cannot be filtered on it.
+    frappe.db.sql(
+        """
+        create table if not exists `__task_tombstone` (
+            `id` bigint not null auto_increment primary key,
+            `task` varchar(140) not null,
+            `task_owner` varchar(140) not null,
+            `deleted_on` datetime(6) not null,
+            key `task_owner_deleted_on_index` (`task_owner`, `deleted_on`, `id`)
+        )
+        """
+    )
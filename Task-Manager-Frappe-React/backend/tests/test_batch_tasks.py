@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from task_manager import api
+
+OTHER_USER = "batch-tasks-test@example.com"
+
+
+class TestBatchTasks(FrappeTestCase):
+    def setUp(self):
+        if not frappe.db.exists("User", OTHER_USER):
+            frappe.get_doc({
+                "doctype": "User",
+                "email": OTHER_USER,
+                "first_name": "Batch",
+                "send_welcome_email": 0
+            }).insert(ignore_permissions=True)
+
+        self.mine = [self.make_task(f"Batch task {i}") for i in range(3)]
+        self.theirs = self.make_task("Someone else's task", owner=OTHER_USER)
+
+    def tearDown(self):
+        frappe.db.rollback()
+
+    def make_task(self, title, owner=None):
+        doc = frappe.get_doc({"doctype": "Task", "title": title, "status": "Open", "priority": "Low"})
+        doc.insert()
+        if owner:
+            frappe.db.set_value("Task", doc.name, "owner", owner, update_modified=False)
+        return doc.name
+
+    def test_batch_update_partial_failure(self):
+        results = api.batch_update_tasks(
+            [self.mine[0], self.theirs, "no-such-task", self.mine[1]],
+            {"priority": "High"}
+        )
+
+        self.assertEqual(
+            [(r["name"], r["ok"], r.get("error")) for r in results],
+            [
+                (self.mine[0], True, None),
+                (self.theirs, False, "Not permitted"),
+                ("no-such-task", False, "Not found"),
+                (self.mine[1], True, None),
+            ]
+        )
+        self.assertEqual(frappe.db.get_value("Task", self.mine[0], "priority"), "High")
+        self.assertEqual(frappe.db.get_value("Task", self.theirs, "priority"), "Low")
+
+    def test_batch_update_runs_document_validation(self):
+        results = api.batch_update_tasks(self.mine[:2], {"status": "Not A Status"})
+
+        self.assertFalse(any(r["ok"] for r in results))
+        self.assertEqual(frappe.db.get_value("Task", self.mine[0], "status"), "Open")
+
+    def test_batch_update_rejects_other_fields(self):
+        with self.assertRaises(frappe.ValidationError):
+            api.batch_update_tasks(self.mine, {"owner": OTHER_USER})
+
+    def test_batch_delete_rolls_back_only_the_failing_item(self):
+        delete_doc = frappe.delete_doc
+
+        def failing_delete(doctype, name, *args, **kwargs):
+            if name == self.mine[1]:
+                raise frappe.ValidationError("cannot delete")
+            return delete_doc(doctype, name, *args, **kwargs)
+
+        with patch.object(frappe, "delete_doc", failing_delete):
+            results = api.batch_delete_tasks(self.mine + [self.theirs])
+
+        self.assertEqual([r["ok"] for r in results], [True, False, True, False])
+        self.assertEqual(results[1]["error"], "cannot delete")
+        self.assertEqual(results[3]["error"], "Not permitted")
+
+        self.assertFalse(frappe.db.exists("Task", self.mine[0]))
+        self.assertTrue(frappe.db.exists("Task", self.mine[1]))
+        self.assertFalse(frappe.db.exists("Task", self.mine[2]))
+        self.assertTrue(frappe.db.exists("Task", self.theirs))
@@ -0,0 +1,62 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date
+
+from task_manager import api
+
+OWNER = "task-changes-test@example.com"
+
+
+class TestTaskChanges(FrappeTestCase):
+    def setUp(self):
+        if not frappe.db.exists("User", OWNER):
+            frappe.get_doc({
+                "doctype": "User",
+                "email": OWNER,
+                "first_name": "Sync",
+                "send_welcome_email": 0
+            }).insert(ignore_permissions=True)
+
+        self.task = frappe.get_doc({"doctype": "Task", "title": "Synced task", "status": "Open"}).insert()
+        frappe.db.set_value("Task", self.task.name, "owner", OWNER, update_modified=False)
+
+    def tearDown(self):
+        frappe.set_user("Administrator")
+        frappe.db.rollback()
+
+    def test_deletion_by_another_user_reaches_the_owner(self):
+        cursor = api._current_sync_cursor(OWNER)
+
+        # deleted by Administrator: the tombstone still belongs to OWNER
+        frappe.delete_doc("Task", self.task.name)
+
+        frappe.set_user(OWNER)
+        changes = api.get_task_changes(cursor)
+
+        self.assertEqual(changes["deleted"], [self.task.name])
+        self.assertFalse(changes["has_more"])
+
+        frappe.set_user("Administrator")
+        self.assertEqual(api.get_task_changes(cursor)["deleted"], [])
+
+    def test_late_commit_behind_the_cursor_is_picked_up(self):
+        cursor = api._current_sync_cursor(OWNER)
+        cursor_modified = frappe.db.get_value("Task", self.task.name, "modified")
+
+        def task_modified_at(title, seconds):
+            doc = frappe.get_doc({"doctype": "Task", "title": title, "status": "Open"}).insert()
+            frappe.db.set_value("Task", doc.name, {
+                "owner": OWNER,
+                "modified": add_to_date(cursor_modified, seconds=seconds)
+            }, update_modified=False)
+            return doc.name
+
+        late = task_modified_at("Committed late", -2)
+        old = task_modified_at("Seen long ago", -60)
+
+        frappe.set_user(OWNER)
+        names = [row.name for row in api.get_task_changes(cursor)["tasks"]]
+
+        self.assertIn(late, names)
+        self.assertNotIn(old, names)
+        self.assertEqual(len(names), len(set(names)))
@@ -8,6 +8,9 @@ function App() {
 
   // 🧾 TASK STATE
   const [tasks, setTasks] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [syncCursor, setSyncCursor] = useState(null);
+  const [selected, setSelected] = useState([]);
   const [title, setTitle] = useState("");
   const [desc, setDesc] = useState("");
   const [dueDate, setDueDate] = useState("");
@@ -56,12 +59,55 @@ function App() {
   };
 
   // 📥 FETCH TASKS (USER-SCOPED BY BACKEND)
-  const fetchTasks = async () => {
-    const res = await fetch('/api/method/task_manager.api.get_tasks', {
+  const fetchTasks = async (cursor = null) => {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const res = await fetch(`/api/method/task_manager.api.get_tasks${query}`, {
       credentials: 'include'
     });
     const data = await res.json();
-    setTasks(data.message || []);
+    const page = data.message?.tasks || [];
+
+    setTasks((prev) => (cursor ? [...prev, ...page] : page));
+    setNextCursor(data.message?.next_cursor || null);
+    if (!cursor) setSyncCursor(data.message?.sync_cursor || null);
+  };
+
+  // 🔄 SYNC CHANGES SINCE LAST FETCH (ONLY CHANGED / DELETED ROWS)
+  const syncTasks = async () => {
+    if (!syncCursor) return fetchTasks();
+
+    let since = syncCursor;
+    let changed = [];
+    let deleted = [];
+    let more = true;
+
+    while (more) {
+      const res = await fetch(
+        `/api/method/task_manager.api.get_task_changes?since=${encodeURIComponent(since)}`,
+        { credentials: 'include' }
+      );
+      const data = (await res.json()).message;
+      if (!data) return fetchTasks();
+
+      changed = changed.concat(data.tasks);
+      deleted = deleted.concat(data.deleted);
+      since = data.cursor;
+      more = data.has_more;
+    }
+
+    setTasks((prev) => {
+      const updates = new Map(changed.map((t) => [t.name, t]));
+      const gone = new Set(deleted);
+      const kept = prev
+        .filter((t) => !gone.has(t.name))
+        .map((t) => updates.get(t.name) || t);
+      const known = new Set(kept.map((t) => t.name));
+      // rows near the cursor are sent again, so take each name once
+      const added = [...updates.values()].filter((t) => !known.has(t.name) && !gone.has(t.name));
+
+      return [...added.reverse(), ...kept];
+    });
+    setSyncCursor(since);
   };
 
   // ➕ ADD TASK
@@ -84,7 +130,7 @@ function App() {
     setDesc("");
     setDueDate("");
     setPriority("Medium");
-    fetchTasks();
+    syncTasks();
   };
 
   // 🔁 UPDATE STATUS
@@ -95,7 +141,7 @@ function App() {
       credentials: 'include',
       body: JSON.stringify({ name, status: newStatus })
     });
-    fetchTasks();
+    syncTasks();
   };
 
   // 🗑️ DELETE TASK
@@ -108,7 +154,39 @@ function App() {
       credentials: 'include',
       body: JSON.stringify({ name })
     });
-    fetchTasks();
+    syncTasks();
+  };
+
+  // ☑️ BULK ACTIONS (ONE REQUEST FOR ALL SELECTED TASKS)
+  const toggleSelected = (name) => {
+    setSelected((prev) =>
+      prev.includes(name) ? prev.filter((n) => n !== name) : [...prev, name]
+    );
+  };
+
+  const runBatch = async (method, body) => {
+    const res = await fetch(`/api/method/task_manager.api.${method}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      credentials: 'include',
+      body: JSON.stringify({ names: selected, ...body })
+    });
+    const data = await res.json();
+    const failed = (data.message || []).filter((r) => !r.ok);
+
+    if (failed.length) {
+      alert(failed.map((r) => `${r.name}: ${r.error}`).join("\n"));
+    }
+
+    setSelected([]);
+    syncTasks();
+  };
+
+  const markSelectedDone = () => runBatch("batch_update_tasks", { changes: { status: "Completed" } });
+
+  const deleteSelected = () => {
+    if (!window.confirm(`Delete ${selected.length} selected task(s)?`)) return;
+    runBatch("batch_delete_tasks");
   };
 
   // 🚫 BLOCK TASK UI IF NOT LOGGED IN
@@ -217,10 +295,34 @@ function App() {
         </button>
       </div>
 
+      {/* BULK ACTIONS */}
+      {selected.length > 0 && (
+        <div style={{ marginBottom: "10px" }}>
+          <button
+            onClick={markSelectedDone}
+            style={{ ...btnStyle, background: "green", fontSize: "12px", marginRight: "5px" }}
+          >
+            Mark {selected.length} done
+          </button>
+          <button
+            onClick={deleteSelected}
+            style={{ ...btnStyle, background: "#d9534f", fontSize: "12px" }}
+          >
+            Delete {selected.length}
+          </button>
+        </div>
+      )}
+
       {/* TASK LIST */}
       <div>
         {tasks.map((t) => (
           <div key={t.name} style={{ borderBottom: "1px solid #eee", padding: "10px 0" }}>
+            <input
+              type="checkbox"
+              checked={selected.includes(t.name)}
+              onChange={() => toggleSelected(t.name)}
+              style={{ marginRight: "8px" }}
+            />
             <strong>{t.title}</strong> ({t.priority})<br />
             <small>{t.description}</small><br />
             <small>Status: {t.status}</small><br />
@@ -242,6 +344,12 @@ function App() {
             </button>
           </div>
         ))}
+
+        {nextCursor && (
+          <button onClick={() => fetchTasks(nextCursor)} style={{ ...btnStyle, width: "100%" }}>
+            Load more
+          </button>
+        )}
       </div>
     </div>
   );
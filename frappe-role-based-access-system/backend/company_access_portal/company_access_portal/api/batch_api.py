@@ -0,0 +1,126 @@
+import frappe
+from frappe import _
+from frappe.utils import strip_html_tags
+from frappe.utils.data import cint
+from werkzeug.wrappers import Response
+
+# ============================================================
+# 📦 BATCH RPC (MANY WHITELISTED CALLS, ONE REQUEST)
+# ============================================================
+# batch_call runs a list of {method, args} against the whitelisted
+# methods of company_access_portal.api.* inside one request (one
+# session lookup, one round trip) and returns one result per call, in
+# order.
+#
+#   atomic=0  every call behaves like its own request: committed when
+#             it succeeds, rolled back when it fails.
+#   atomic=1  all calls share one transaction. utils.commit() defers
+#             to the batch, which commits only if every call succeeded
+#             and otherwise rolls everything back and stops.
+
+ALLOWED_PREFIX = "company_access_portal.api."
+MAX_CALLS = 100
+
+
+def _resolve(method):
+    if not isinstance(method, str) or not method.startswith(ALLOWED_PREFIX):
+        frappe.throw(_("Only {0}* methods can be batched").format(ALLOWED_PREFIX), frappe.PermissionError)
+
+    if method == f"{ALLOWED_PREFIX}batch_api.batch_call":
+        frappe.throw(_("batch_call cannot be nested"))
+
+    fn = frappe.get_attr(method)
+
+    # same whitelist / guest checks as a direct /api/method call
+    frappe.is_whitelisted(fn)
+
+    return fn
+
+
+def _error_message(error):
+    messages = [strip_html_tags(m.get("message", "")) for m in _message_log()]
+    return messages[-1] if messages else (str(error) or type(error).__name__)
+
+
+def _message_log():
+    return [
+        frappe.parse_json(m) if isinstance(m, str) else m
+        for m in (frappe.local.message_log or [])
+    ]
+
+
+def _run(call):
+    if not isinstance(call, dict):
+        frappe.throw(_("Each call must be an object with method and args"))
+
+    args = call.get("args") or {}
+    if isinstance(args, str):
+        args = frappe.parse_json(args)
+
+    fn = _resolve(call.get("method"))
+    result = frappe.call(fn, **args)
+
+    if isinstance(result, Response):
+        frappe.throw(_("Streaming methods cannot be batched"))
+
+    return result
+
+
+@frappe.whitelist(methods=["POST"])
+def batch_call(calls, atomic=0):
+    """Run ``[{method, args}, ...]`` and return ``[{ok, result | error}, ...]``."""
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Not Logged In"), frappe.PermissionError)
+
+    calls = frappe.parse_json(calls) if isinstance(calls, str) else calls
+    if not isinstance(calls, list):
+        frappe.throw(_("calls must be a list"))
+
+    if len(calls) > MAX_CALLS:
+        frappe.throw(_("At most {0} calls per batch").format(MAX_CALLS))
+
+    atomic = cint(atomic)
+    results = []
+
+    frappe.flags.company_access_atomic_batch = bool(atomic)
+    try:
+        for call in calls:
+            frappe.local.message_log = []
+            frappe.local.response.pop("http_status_code", None)
+
+            try:
+                result = _run(call)
+            except Exception as e:
+                frappe.db.rollback()
+                results.append({
+                    "ok": False,
+                    "error": _error_message(e),
+                    "exc_type": type(e).__name__
+                })
+
+                if atomic:
+                    break
+            else:
+                if not atomic:
+                    frappe.db.commit()
+                results.append({"ok": True, "result": result})
+
+        if atomic:
+            if len(results) == len(calls) and all(r["ok"] for r in results):
+                frappe.db.commit()
+            else:
+                # earlier results were rolled back with the failing call
+                for r in results:
+                    if r["ok"]:
+                        r.pop("result")
+                        r.update({"ok": False, "error": _("Rolled back"), "rolled_back": True})
+                results.extend(
+                    {"ok": False, "error": _("Skipped"), "skipped": True}
+                    for _call in calls[len(results):]
+                )
+    finally:
+        frappe.flags.company_access_atomic_batch = False
+        frappe.local.message_log = []
+        frappe.local.response.pop("http_status_code", None)
+
+    return results
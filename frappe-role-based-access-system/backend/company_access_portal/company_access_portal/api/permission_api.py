@@ -0,0 +1,51 @@
+import frappe
+from frappe import _
+
+from company_access_portal import permission_evaluator
+from company_access_portal.api.role_api import get_company_access_doctypes, is_company_admin
+
+# ============================================================
+# 🧮 EFFECTIVE CAPABILITIES (CURRENT USER)
+# ============================================================
+
+def get_capability_map(user, doctypes):
+    capabilities = {}
+
+    for doctype in doctypes:
+        mask, owner_mask = permission_evaluator.get_masks(doctype, user)
+        capabilities[doctype] = {
+            "mask": mask,
+            "owner_mask": owner_mask,
+            "permissions": permission_evaluator.mask_to_ptypes(mask),
+            "owner_permissions": permission_evaluator.mask_to_ptypes(owner_mask)
+        }
+
+    return capabilities
+
+
+@frappe.whitelist()
+def get_capabilities(doctype=None, user=None):
+    """Effective permission masks of a user on Company Access doctypes.
+
+    `mask` applies to every document, `owner_mask` only to documents
+    owned by the user. Bit positions are returned in `bits`.
+    """
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Not Logged In"), frappe.PermissionError)
+
+    if user and user != frappe.session.user and not is_company_admin():
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    user = user or frappe.session.user
+    allowed_doctypes = get_company_access_doctypes()
+
+    if doctype:
+        if doctype not in allowed_doctypes:
+            frappe.throw(_("DocType does not exist"))
+        allowed_doctypes = [doctype]
+
+    return {
+        "user": user,
+        "bits": permission_evaluator.PERMISSION_BITS,
+        "doctypes": get_capability_map(user, allowed_doctypes)
+    }
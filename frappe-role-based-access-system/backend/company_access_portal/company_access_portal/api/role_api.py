@@ -2,6 +2,9 @@ import frappe
 from frappe import _
 from frappe.utils.data import cint
 
+from company_access_portal import catalog, permission_evaluator, role_cache, role_usage
+from company_access_portal.utils import commit, get_page_length, get_version, like_prefix
+
 
 # ============================================================
 # 🔐 ADMIN VALIDATION
@@ -13,8 +16,7 @@ def is_company_admin():
     if not user or user == "Guest":
         return False
 
-    roles = frappe.get_roles(user)
-    return "Company Admin" in roles or "System Manager" in roles
+    return role_cache.has_any_role(role_cache.ADMIN_ROLES, user)
 
 
 def throw_if_not_admin():
@@ -42,35 +44,97 @@ BUSINESS_ROLES = [
 ]
 
 
+# ============================================================
+# 🔑 PERMISSION TYPES EDITABLE FROM THE PORTAL
+# ============================================================
+
+PERMISSION_TYPES = ["read", "write", "create", "delete", "submit"]
+
+
+def get_company_access_doctypes():
+    return catalog.get_catalog()["doctypes"]
+
+
+def on_permissions_changed(doctypes):
+    # DocPerm rows are saved directly, so the doctype meta cache has to
+    # be dropped by hand (once per doctype, not once per row).
+    doctypes = set(doctypes)
+
+    for doctype in doctypes:
+        frappe.clear_cache(doctype=doctype)
+
+    permission_evaluator.invalidate(doctypes)
+
+
 # ============================================================
 # 1️⃣ LIST ROLES (BUSINESS + ALL NON-SYSTEM ROLES)
 # ============================================================
 
+ROLE_LIST_CACHE_TTL = 24 * 60 * 60
+
+
+def _query_roles(search=None, after=None, limit=None, with_counts=False):
+    conditions = ["r.`name` not in %(system_roles)s"]
+    values = {"system_roles": SYSTEM_ROLES}
+
+    if search:
+        conditions.append("r.`name` like %(prefix)s")
+        values["prefix"] = like_prefix(search)
+
+    if after:
+        conditions.append("r.`name` > %(after)s")
+        values["after"] = after
+
+    return frappe.db.sql(
+        f"""
+        select r.`name`{", coalesce(ru.`user_count`, 0) as `user_count`" if with_counts else ""}
+        from `tabRole` r
+        {"left join `tabCompany Role Usage` ru on ru.`name` = r.`name`" if with_counts else ""}
+        where {" and ".join(conditions)}
+        order by r.`name` asc
+        {f"limit {cint(limit)}" if limit else ""}
+        """,
+        values,
+        as_dict=True
+    )
+
+
 @frappe.whitelist()
-def list_roles():
+def list_roles(search=None, after=None, limit=None, with_counts=0, with_type=0):
+    """Non-system roles ordered by name.
+
+    Optional `search` (name prefix), keyset paging with `after` (last name
+    of the previous page) + `limit`, per-role user counts and a
+    business / custom classification. Results are cached per role-table
+    version (and role-assignment version when counts are included).
+    """
     throw_if_not_admin()
 
-    all_roles = frappe.get_all("Role", pluck="name")
+    search = (search or "").strip()
+    limit = get_page_length(limit, maximum=1000) if limit else None
+    with_counts, with_type = cint(with_counts), cint(with_type)
 
-    filtered = []
+    versions = [get_version(role_cache.ROLE_TABLE_VERSION)]
+    if with_counts:
+        versions.append(get_version(role_cache.ROLE_VERSION))
 
-    for name in all_roles:
+    cache_key = "company_access_portal:list_roles:" + frappe.as_json(
+        [versions, search, after, limit, with_counts, with_type], indent=None
+    )
 
-        # Skip system roles
-        if name in SYSTEM_ROLES:
-            continue
+    roles = frappe.cache().get_value(cache_key)
+    if roles is not None:
+        return roles
 
-        # Always include business roles
-        if name in BUSINESS_ROLES:
-            filtered.append({"name": name})
-            continue
+    roles = _query_roles(search, after, limit, with_counts)
 
-        # Include any other non-system roles
-        filtered.append({"name": name})
+    if with_type:
+        for role in roles:
+            role["type"] = "business" if role.name in BUSINESS_ROLES else "custom"
 
-    filtered = sorted(filtered, key=lambda x: x["name"].lower())
+    frappe.cache().set_value(cache_key, roles, expires_in_sec=ROLE_LIST_CACHE_TTL)
 
-    return filtered
+    return roles
 
 
 # ============================================================
@@ -102,7 +166,7 @@ def create_role(role_name=None):
     role.role_name = role_name
     role.insert(ignore_permissions=True)
 
-    frappe.db.commit()
+    commit()
 
     return {"message": "Role created successfully"}
 
@@ -127,17 +191,11 @@ def delete_role(role_name=None):
     if not frappe.db.exists("Role", role_name):
         frappe.throw(_("Role does not exist"))
 
-    users_with_role = frappe.get_all(
-        "Has Role",
-        filters={"role": role_name},
-        pluck="parent"
-    )
-
-    if users_with_role:
+    if frappe.db.exists("Has Role", {"role": role_name}):
         frappe.throw(_("Cannot delete role assigned to users"))
 
     frappe.delete_doc("Role", role_name, ignore_permissions=True)
-    frappe.db.commit()
+    commit()
 
     return {"message": "Role deleted successfully"}
 
@@ -150,22 +208,7 @@ def delete_role(role_name=None):
 def list_modules_with_doctypes():
     throw_if_not_admin()
 
-    doctypes = frappe.get_all(
-        "DocType",
-        filters={
-            "module": "Company Access",
-            "istable": 0,
-            "issingle": 0
-        },
-        fields=["name", "module"],
-        order_by="name asc"
-    )
-
-    grouped = {}
-    for dt in doctypes:
-        grouped.setdefault(dt.module, []).append(dt.name)
-
-    return grouped
+    return catalog.get_catalog()["modules"]
 
 
 # ============================================================
@@ -182,11 +225,7 @@ def get_role_permissions(role=None):
     if not frappe.db.exists("Role", role):
         frappe.throw(_("Role does not exist"))
 
-    allowed_doctypes = frappe.get_all(
-        "DocType",
-        filters={"module": "Company Access"},
-        pluck="name"
-    )
+    allowed_doctypes = catalog.get_catalog()["all_doctypes"]
 
     return frappe.get_all(
         "DocPerm",
@@ -227,11 +266,10 @@ def update_doctype_permission(
     if not frappe.db.exists("Role", role):
         frappe.throw(_("Role does not exist"))
 
-    if not frappe.db.exists("DocType", doctype):
-        frappe.throw(_("DocType does not exist"))
+    if doctype not in catalog.get_catalog()["doctypes"]:
+        if not frappe.db.exists("DocType", doctype):
+            frappe.throw(_("DocType does not exist"))
 
-    dt_module = frappe.db.get_value("DocType", doctype, "module")
-    if dt_module != "Company Access":
         frappe.throw(_("Permission editing allowed only for Company Access module"))
 
     read = cint(read)
@@ -261,6 +299,200 @@ def update_doctype_permission(
     perm.submit = submit
 
     perm.save(ignore_permissions=True)
-    frappe.db.commit()
+    on_permissions_changed([doctype])
+    commit()
+
+    return {"message": "Permissions updated successfully"}
+
+
+# ============================================================
+# 7️⃣ ROLE CACHE STATS
+# ============================================================
+
+@frappe.whitelist()
+def get_role_cache_stats():
+    throw_if_not_admin()
+
+    return role_cache.get_stats()
+
+
+# ============================================================
+# 8️⃣ PERMISSION MATRIX (ALL ROLES x ALL DOCTYPES)
+# ============================================================
+
+@frappe.whitelist()
+def get_permission_matrix():
+    throw_if_not_admin()
 
-    return {"message": "Permissions updated successfully"}
\ No newline at end of file
+    roles = frappe.get_all(
+        "Role",
+        filters={"name": ["not in", SYSTEM_ROLES]},
+        order_by="name asc",
+        pluck="name"
+    )
+    doctypes = get_company_access_doctypes()
+
+    matrix = {
+        role: {dt: dict.fromkeys(PERMISSION_TYPES, 0) for dt in doctypes}
+        for role in roles
+    }
+
+    if roles and doctypes:
+        rows = frappe.db.sql(
+            """
+            select `role`, `parent`,
+                max(`read`) as `read`, max(`write`) as `write`,
+                max(`create`) as `create`, max(`delete`) as `delete`,
+                max(`submit`) as `submit`
+            from `tabDocPerm`
+            where `parent` in %(doctypes)s and `permlevel` = 0
+            group by `role`, `parent`
+            """,
+            {"doctypes": doctypes},
+            as_dict=True
+        )
+
+        for row in rows:
+            if row.role in matrix:
+                matrix[row.role][row.parent] = {
+                    ptype: cint(row[ptype]) for ptype in PERMISSION_TYPES
+                }
+
+    return {
+        "roles": roles,
+        "doctypes": doctypes,
+        "permission_types": PERMISSION_TYPES,
+        "matrix": matrix
+    }
+
+
+# ============================================================
+# 9️⃣ APPLY PERMISSION CHANGES (BATCH)
+# ============================================================
+
+@frappe.whitelist()
+def apply_permission_changes(changes=None):
+    """Apply a list of ``{role, doctype, <ptype>: 0/1, ...}`` diffs.
+
+    Only the permission types present in a diff are touched. All diffs
+    are validated first and written in a single transaction.
+    """
+    throw_if_not_admin()
+
+    changes = frappe.parse_json(changes) or []
+
+    if not isinstance(changes, list):
+        frappe.throw(_("Changes must be a list"))
+
+    if not all(isinstance(c, dict) for c in changes):
+        frappe.throw(_("Each change must be an object"), frappe.ValidationError)
+
+    if not changes:
+        return {"message": "No changes", "updated": 0, "created": 0}
+
+    # ---------------- Validation ----------------
+
+    allowed_doctypes = set(get_company_access_doctypes())
+
+    roles = {c.get("role") for c in changes if isinstance(c.get("role"), str)}
+    existing_roles = set(frappe.get_all(
+        "Role",
+        filters={"name": ["in", list(roles)]},
+        pluck="name"
+    ))
+
+    merged = {}
+
+    for change in changes:
+        role = change.get("role")
+        doctype = change.get("doctype")
+
+        if not (role and isinstance(role, str) and doctype and isinstance(doctype, str)):
+            frappe.throw(_("Role and DocType are required"))
+
+        if role in SYSTEM_ROLES or role not in existing_roles:
+            frappe.throw(_("Role does not exist: {0}").format(role))
+
+        if doctype not in allowed_doctypes:
+            frappe.throw(_("Permission editing allowed only for Company Access module"))
+
+        values = merged.setdefault((role, doctype), {})
+        for ptype in PERMISSION_TYPES:
+            if ptype in change:
+                values[ptype] = cint(change[ptype])
+
+    # ---------------- Existing rows (one query) ----------------
+
+    existing = {}
+    for row in frappe.get_all(
+        "DocPerm",
+        filters={
+            "role": ["in", list(roles)],
+            "parent": ["in", list({dt for _role, dt in merged})],
+            "permlevel": 0
+        },
+        fields=["name", "role", "parent"],
+        order_by="idx asc"
+    ):
+        existing.setdefault((row.role, row.parent), row.name)
+
+    # ---------------- Write ----------------
+
+    updated = created = 0
+
+    for (role, doctype), values in merged.items():
+        if not values:
+            continue
+
+        name = existing.get((role, doctype))
+
+        if name:
+            frappe.db.set_value("DocPerm", name, values, update_modified=False)
+            updated += 1
+        else:
+            perm = frappe.new_doc("DocPerm")
+            perm.parent = doctype
+            perm.parenttype = "DocType"
+            perm.parentfield = "permissions"
+            perm.role = role
+            perm.update(values)
+            perm.save(ignore_permissions=True)
+            created += 1
+
+    on_permissions_changed(doctype for _role, doctype in merged)
+    commit()
+
+    return {
+        "message": "Permissions updated successfully",
+        "updated": updated,
+        "created": created
+    }
+
+
+# ============================================================
+# 🔟 ROLE USAGE SUMMARY
+# ============================================================
+
+@frappe.whitelist()
+def role_usage_summary(refresh=0):
+    """Users per role, from the incrementally maintained counter table.
+
+    `refresh=1` recomputes the counters with one GROUP BY over Has Role.
+    """
+    throw_if_not_admin()
+
+    if cint(refresh):
+        counts = role_usage.rebuild()
+        commit()
+    else:
+        counts = role_usage.get_counts()
+
+    return sorted(
+        (
+            {"role": role, "user_count": counts.get(role, 0)}
+            for role in frappe.get_all(
+                "Role", filters={"name": ["not in", SYSTEM_ROLES]}, pluck="name"
+            )
+        ),
+        key=lambda x: x["role"].lower()
+    )
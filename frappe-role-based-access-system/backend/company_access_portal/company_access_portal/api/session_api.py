@@ -0,0 +1,89 @@
+import hashlib
+
+import frappe
+from frappe import _
+
+from company_access_portal import catalog, permission_evaluator, role_cache, task_realtime
+from company_access_portal.api import role_api
+from company_access_portal.api.permission_api import get_capability_map
+from company_access_portal.api.task_api import get_task_changes_for
+from company_access_portal.utils import get_version
+
+# ============================================================
+# 🚀 SESSION BOOTSTRAP (ONE ROUND TRIP FOR FIRST PAINT)
+# ============================================================
+
+BOOTSTRAP_TASK_LIMIT = 200
+
+
+def get_bootstrap_version(user):
+    """ETag for the bootstrap payload of `user`.
+
+    Derived from the role, role table, permission and catalog change
+    counters, so it only changes when something embedded in the payload may
+    have. Tasks are left out on purpose: they change far more often than the
+    rest, and clients catch up on them from `tasks.cursor` instead.
+    """
+    stamp = "|".join([
+        user,
+        str(get_version(role_cache.ROLE_VERSION)),
+        str(get_version(role_cache.ROLE_TABLE_VERSION)),
+        str(get_version(permission_evaluator.PERMISSION_VERSION)),
+        str(get_version(catalog.CATALOG_VERSION))
+    ])
+
+    return hashlib.sha1(stamp.encode()).hexdigest()
+
+
+def _set_etag(etag):
+    headers = getattr(frappe.local, "response_headers", None)
+    if headers is not None:
+        headers["ETag"] = f'"{etag}"'
+        headers["Cache-Control"] = "private, no-cache"
+
+
+@frappe.whitelist()
+def bootstrap(etag=None):
+    """User, roles, capabilities, module catalog and a first task snapshot.
+
+    Send back the last `version` as `etag` (or an If-None-Match header);
+    when nothing changed the response is an empty 304. `tasks` is the first
+    page of get_task_changes; a cached copy may be stale, so always continue
+    with get_task_changes from `tasks.cursor`.
+    """
+    user = frappe.session.user
+
+    if user == "Guest":
+        frappe.throw(_("Not Logged In"), frappe.PermissionError)
+
+    version = get_bootstrap_version(user)
+    _set_etag(version)
+
+    client_etag = etag or (frappe.get_request_header("If-None-Match") or "").strip('W/"')
+    if client_etag == version:
+        frappe.local.response.http_status_code = 304
+        return None
+
+    is_admin = role_api.is_company_admin()
+    doctypes = role_api.get_company_access_doctypes()
+
+    return {
+        "version": version,
+        "user": {
+            "email": user,
+            "roles": sorted(role_cache.get_roles(user))
+        },
+        "is_admin": is_admin,
+        "capabilities": {
+            "bits": permission_evaluator.PERMISSION_BITS,
+            "doctypes": get_capability_map(user, doctypes)
+        },
+        "roles": role_api.list_roles() if is_admin else [],
+        "modules": role_api.list_modules_with_doctypes() if is_admin else {},
+        "tasks": get_task_changes_for(user, limit=BOOTSTRAP_TASK_LIMIT),
+        "realtime": {
+            "site": frappe.local.site,
+            "port": frappe.conf.get("socketio_port") or 9000,
+            "task_event": task_realtime.EVENT
+        }
+    }
@@ -0,0 +1,393 @@
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, now_datetime
+from frappe.utils.data import cint
+
+from company_access_portal import (
+    exports,
+    permission_evaluator,
+    role_cache,
+    task_archive,
+    task_search,
+    task_summary,
+    task_sync,
+)
+from company_access_portal.company_access.doctype.company_task.company_task import (
+    get_permission_query_conditions,
+    get_read_conditions,
+)
+from company_access_portal.utils import commit, decode_cursor, encode_cursor, get_page_length, like_prefix
+
+# ============================================================
+# 📋 COMPANY TASK LIST (KEYSET PAGINATED)
+# ============================================================
+
+TASK_LIST_FIELDS = ["name", "title", "status", "assigned_to", "owner", "modified"]
+
+TASK_STATUSES = ["Open", "In Progress", "Completed"]
+
+
+def get_task_list_conditions(user, status=None, table="tabCompany Task"):
+    """``(conditions, values)`` shared by list_tasks and export_tasks."""
+    condition = get_read_conditions(user, table)
+    conditions = [condition] if condition else []
+    values = {}
+
+    if status:
+        if status not in TASK_STATUSES:
+            frappe.throw(_("Invalid status"))
+        conditions.append("`status` = %(status)s")
+        values["status"] = status
+
+    return conditions, values
+
+
+def get_task_list_query(user, fields, status=None, include_archived=0, extra_conditions=None, limit=None):
+    """``(query, values)`` reading `fields` from Company Task and, with
+    `include_archived`, Company Task Archive, newest first.
+
+    Each table gets its own ordered (and limited) branch so both stay on
+    their (modified) indexes; the branches are merged with UNION ALL.
+    """
+    branches = []
+    for doctype in task_archive.get_task_tables(include_archived):
+        conditions, values = get_task_list_conditions(user, status, f"tab{doctype}")
+        conditions += extra_conditions or []
+
+        branches.append(
+            f"""
+            select {", ".join(f"`{f}`" for f in fields)}
+            from `tab{doctype}`
+            {"where " + " and ".join(conditions) if conditions else ""}
+            order by `modified` desc, `name` desc
+            {f"limit {limit}" if limit else ""}
+            """
+        )
+
+    if len(branches) == 1:
+        return branches[0], values
+
+    query = " union all ".join(f"({branch})" for branch in branches)
+    query += " order by `modified` desc, `name` desc"
+    if limit:
+        query += f" limit {limit}"
+
+    return query, values
+
+
+def get_task_page(user, cursor=None, limit=20, status=None, include_archived=0):
+    extra_conditions = []
+    position = decode_cursor(cursor)
+    if position:
+        extra_conditions.append(
+            "(`modified` < %(modified)s or (`modified` = %(modified)s and `name` < %(name)s))"
+        )
+
+    query, values = get_task_list_query(
+        user, TASK_LIST_FIELDS, status, include_archived, extra_conditions, limit + 1
+    )
+    if position:
+        values.update({"modified": position[0], "name": position[1]})
+
+    tasks = frappe.db.sql(query, values, as_dict=True)
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1].modified, tasks[-1].name)
+
+    return {"tasks": tasks, "next_cursor": next_cursor}
+
+
+@frappe.whitelist()
+def list_tasks(cursor=None, limit=20, status=None, include_archived=0):
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Not Logged In"), frappe.PermissionError)
+
+    return get_task_page(
+        frappe.session.user, cursor, get_page_length(limit, default=20), status, include_archived
+    )
+
+
+EXPORT_TASK_FIELDS = ["name", "title", "status", "assigned_to", "description", "owner", "creation", "modified"]
+
+
+@frappe.whitelist()
+def export_tasks(format="csv", status=None, include_archived=0):
+    """Stream every task visible in list_tasks as a CSV / NDJSON download."""
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Not Logged In"), frappe.PermissionError)
+
+    query, values = get_task_list_query(frappe.session.user, EXPORT_TASK_FIELDS, status, include_archived)
+
+    return exports.stream_export("company-tasks", EXPORT_TASK_FIELDS, query, values, format)
+
+
+# ============================================================
+# 🔄 COMPANY TASK DELTA SYNC
+# ============================================================
+# Clients keep a local copy of their task list and poll with the last
+# cursor. The cursor holds two keyset positions, (modified, name) for
+# tasks and (deleted_on, name) for tombstones, so each poll only reads
+# rows written since the previous one.
+#
+# `modified` / `deleted_on` are stamped before commit, so a transaction
+# committing late can land behind a cursor that has already moved on.
+# Each poll therefore also re-reads the last SYNC_OVERLAP_SECONDS behind
+# the cursor; the repeated rows are deduplicated by name.
+
+SYNC_FIELDS = [*TASK_LIST_FIELDS, "description", "creation"]
+SYNC_START = ["1900-01-01 00:00:00", ""]
+SYNC_OVERLAP_SECONDS = 5
+
+
+def _keyset_condition(column, overlap):
+    if overlap:
+        # the window behind the cursor, cursor row included
+        return (
+            f"(`{column}` >= %(window_start)s and (`{column}` < %({column})s"
+            f" or (`{column}` = %({column})s and `name` <= %(name)s)))"
+        )
+
+    return f"(`{column}` > %({column})s or (`{column}` = %({column})s and `name` > %(name)s))"
+
+
+def _get_changed_tasks(user, position, limit, overlap=False):
+    condition = get_permission_query_conditions(user)
+    conditions = [condition] if condition else []
+    conditions.append(_keyset_condition("modified", overlap))
+
+    return frappe.db.sql(
+        f"""
+        select {", ".join(f"`{f}`" for f in SYNC_FIELDS)}
+        from `tabCompany Task`
+        where {" and ".join(conditions)}
+        order by `modified` asc, `name` asc
+        limit {limit + 1}
+        """,
+        {
+            "modified": position[0],
+            "name": position[1],
+            "window_start": add_to_date(position[0], seconds=-SYNC_OVERLAP_SECONDS)
+        },
+        as_dict=True
+    )
+
+
+def _get_tombstones(user, position, limit, overlap=False):
+    condition = task_sync.get_tombstone_conditions(user)
+    conditions = [condition] if condition else []
+    conditions.append(_keyset_condition("deleted_on", overlap))
+
+    # reassigning a task tombstones it for the previous assignee only;
+    # skip tombstones of tasks this user can still see
+    live_condition = get_read_conditions(user, "live")
+    conditions.append(
+        f"""not exists (
+            select 1 from `tabCompany Task` live
+            where live.`name` = `tab{task_sync.TOMBSTONE_DOCTYPE}`.`task`
+            {"and " + live_condition if live_condition else ""}
+        )"""
+    )
+
+    return frappe.db.sql(
+        f"""
+        select `name`, `task`, `deleted_on`
+        from `tab{task_sync.TOMBSTONE_DOCTYPE}`
+        where {" and ".join(conditions)}
+        order by `deleted_on` asc, `name` asc
+        limit {limit + 1}
+        """,
+        {
+            "deleted_on": position[0],
+            "name": position[1],
+            "window_start": add_to_date(position[0], seconds=-SYNC_OVERLAP_SECONDS)
+        },
+        as_dict=True
+    )
+
+
+def _latest_tombstone_position():
+    row = frappe.db.sql(
+        f"""
+        select `deleted_on`, `name`
+        from `tab{task_sync.TOMBSTONE_DOCTYPE}`
+        order by `deleted_on` desc, `name` desc
+        limit 1
+        """
+    )
+
+    return [str(row[0][0]), row[0][1]] if row else [str(now_datetime()), ""]
+
+
+def get_task_changes_for(user, since=None, limit=200):
+    position = decode_cursor(since, size=4)
+
+    if position:
+        purged_before = task_sync.get_purged_before()
+        if purged_before and position[2] < purged_before:
+            # tombstones this client still needs are gone: start over
+            return {"reset": True, "tasks": [], "deleted": [], "cursor": None, "has_more": True}
+
+        task_position, tombstone_position = position[:2], position[2:]
+        tombstones = _get_tombstones(user, tombstone_position, limit)
+        recent_tasks = _get_changed_tasks(user, task_position, limit, overlap=True)[:limit]
+        recent_tombstones = _get_tombstones(user, tombstone_position, limit, overlap=True)[:limit]
+    else:
+        # full snapshot: nothing to delete yet, watch tombstones from now on
+        task_position, tombstone_position = SYNC_START, _latest_tombstone_position()
+        tombstones, recent_tasks, recent_tombstones = [], [], []
+
+    tasks = _get_changed_tasks(user, task_position, limit)
+
+    has_more = len(tasks) > limit or len(tombstones) > limit
+    tasks, tombstones = tasks[:limit], tombstones[:limit]
+
+    if tasks:
+        task_position = [tasks[-1].modified, tasks[-1].name]
+    if tombstones:
+        tombstone_position = [tombstones[-1].deleted_on, tombstones[-1].name]
+
+    return {
+        "reset": False,
+        "tasks": list({row.name: row for row in [*recent_tasks, *tasks]}.values()),
+        "deleted": list(dict.fromkeys(row.task for row in [*recent_tombstones, *tombstones])),
+        "cursor": encode_cursor(*task_position, *tombstone_position),
+        "has_more": has_more
+    }
+
+
+@frappe.whitelist()
+def get_task_changes(since=None, limit=200):
+    """Tasks created or modified after `since`, plus names of deleted tasks.
+
+    Call without `since` for a full (paged) snapshot, then pass back the
+    returned `cursor`. Keep calling while `has_more` is set. When `reset`
+    is set the cursor is too old: drop the local copy and start again.
+    Rows changed just before the cursor are sent again; apply them by name.
+    """
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Not Logged In"), frappe.PermissionError)
+
+    return get_task_changes_for(frappe.session.user, since, get_page_length(limit, default=200))
+
+
+# ============================================================
+# 📈 COMPANY TASK SUMMARY (REPORTS)
+# ============================================================
+
+REPORT_ROLES = (*role_cache.ADMIN_ROLES, "Reports Only")
+
+
+@frappe.whitelist()
+def get_task_summary(from_date=None, to_date=None, refresh=0):
+    """Task counts per (assigned_to, status) and per creation day / status.
+
+    Served from the counter table kept by task_summary, so the cost does
+    not grow with the number of tasks. Open to REPORT_ROLES and to users
+    with report rights on every Company Task (If Owner rights are not
+    enough, the counters cover all tasks). `refresh=1` (admins) rebuilds
+    the counters first.
+    """
+    user = frappe.session.user
+    mask, _owner_mask = permission_evaluator.get_masks("Company Task", user)
+
+    if not (
+        role_cache.has_any_role(REPORT_ROLES, user)
+        or mask & permission_evaluator.PERMISSION_BITS["report"]
+    ):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    if cint(refresh) and role_cache.has_any_role(role_cache.ADMIN_ROLES, user):
+        task_summary.rebuild()
+        commit()
+
+    return task_summary.get_summary(from_date, to_date)
+
+
+# ============================================================
+# 🔎 COMPANY TASK SEARCH
+# ============================================================
+# Served by the token index of task_search. Every query word must
+# match; the last one also matches as a prefix, so results update
+# while the user is typing. Ranked by summed token weight.
+
+def search_task_page(user, q, cursor=None, limit=20, include_archived=0):
+    tokens = list(dict.fromkeys(task_search.tokenize(q)))[:task_search.MAX_QUERY_TOKENS]
+    if not tokens:
+        return {"tasks": [], "next_cursor": None}
+
+    exact, prefix = tokens[:-1], tokens[-1]
+    values = {"prefix": like_prefix(prefix), "terms": len(tokens)}
+
+    # which query word a token row satisfies; the prefix word also
+    # covers its exact match
+    cases = []
+    for index, token in enumerate(exact):
+        values[f"t{index}"] = token
+        cases.append(f"when st.`token` = %(t{index})s then {index}")
+    cases.append(f"when st.`token` like %(prefix)s then {len(exact)}")
+
+    token_filter = "st.`token` like %(prefix)s"
+    if exact:
+        token_filter = f"(st.`token` in %(exact)s or {token_filter})"
+        values["exact"] = exact
+
+    position = decode_cursor(cursor)
+    if position:
+        values.update({"score": cint(position[0]), "name": position[1]})
+
+    # archived tasks keep their tokens, so the archive is searched with
+    # the same token rows joined to the other table
+    branches = []
+    for doctype in task_archive.get_task_tables(include_archived):
+        table = f"tab{doctype}"
+        condition = get_read_conditions(user, table)
+
+        having = ""
+        if position:
+            having = (
+                "and (`score` < %(score)s or (`score` = %(score)s"
+                f" and `{table}`.`name` > %(name)s))"
+            )
+
+        branches.append(
+            f"""
+            select {", ".join(f"`{table}`.`{f}`" for f in TASK_LIST_FIELDS)},
+                sum(st.`weight`) as `score`
+            from `tab{task_search.TOKEN_DOCTYPE}` st
+            join `{table}` on `{table}`.`name` = st.`task`
+            where {token_filter}
+                {"and " + condition if condition else ""}
+            group by `{table}`.`name`
+            having count(distinct case {" ".join(cases)} end) = %(terms)s
+                {having}
+            order by `score` desc, `{table}`.`name` asc
+            limit {limit + 1}
+            """
+        )
+
+    query = branches[0]
+    if len(branches) > 1:
+        query = " union all ".join(f"({branch})" for branch in branches)
+        query += f" order by `score` desc, `name` asc limit {limit + 1}"
+
+    tasks = frappe.db.sql(query, values, as_dict=True)
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1].score, tasks[-1].name)
+
+    return {"tasks": tasks, "next_cursor": next_cursor}
+
+
+@frappe.whitelist()
+def search_tasks(q, limit=20, cursor=None, include_archived=0):
+    """Ranked full-text search over title and description of visible tasks."""
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Not Logged In"), frappe.PermissionError)
+
+    return search_task_page(
+        frappe.session.user, q, cursor, get_page_length(limit, default=20), include_archived
+    )
@@ -1,8 +1,11 @@
 import frappe
 from frappe import _
-from frappe.utils import now_datetime, random_string, validate_email_address
+from frappe.utils import now_datetime, validate_email_address
+from frappe.utils.data import cint
 from frappe.utils.password import update_password
-from datetime import timedelta
+
+from company_access_portal import bulk_users, exports, invitations, reset_tokens, role_cache, role_usage
+from company_access_portal.utils import commit, decode_cursor, encode_cursor, get_page_length, like_prefix
 
 
 # ============================================================
@@ -14,8 +17,7 @@ def is_company_admin():
     if not user or user == "Guest":
         return False
 
-    roles = frappe.get_roles(user)
-    return "Company Admin" in roles or "System Manager" in roles
+    return role_cache.has_any_role(role_cache.ADMIN_ROLES, user)
 
 
 def throw_if_not_admin():
@@ -27,21 +29,159 @@ def throw_if_not_admin():
 # 👤 LIST USERS (ADMIN ONLY)
 # ============================================================
 
+LIST_USER_FIELDS = [
+    "name",
+    "email",
+    "first_name",
+    "last_name",
+    "full_name",
+    "enabled",
+    "user_type",
+    "last_login",
+    "creation"
+]
+
+DEFAULT_LIST_USER_FIELDS = ["name", "first_name", "last_name", "enabled", "creation"]
+
+USER_COUNT_TTL = 300
+SEARCH_COUNT_CAP = 1000
+
+
+def _estimate_user_count(conditions, values, search):
+    """Cached total for the unfiltered list, capped count for searches."""
+    if not search:
+        key = "company_access_portal:enabled_user_count"
+        total = frappe.cache().get_value(key)
+
+        if total is None:
+            total = frappe.db.sql(f"select count(*) from `tabUser` where {conditions}", values)[0][0]
+            frappe.cache().set_value(key, total, expires_in_sec=USER_COUNT_TTL)
+
+        return {"total": total, "exact": False}
+
+    total = frappe.db.sql(
+        f"""select count(*) from (
+            select 1 from `tabUser` where {conditions} limit {SEARCH_COUNT_CAP + 1}
+        ) t""",
+        values
+    )[0][0]
+
+    return {"total": min(total, SEARCH_COUNT_CAP), "exact": total <= SEARCH_COUNT_CAP}
+
+
+def get_user_list_conditions(search=None):
+    """``(conditions, values)`` shared by list_users and export_users."""
+    conditions = ["`enabled` = 1"]
+    values = {}
+
+    if search:
+        conditions.append(
+            "(`name` like %(prefix)s or `first_name` like %(prefix)s or `full_name` like %(prefix)s)"
+        )
+        values["prefix"] = like_prefix(search)
+
+    return conditions, values
+
+
+def _parse_fields(fields):
+    """`fields` as a JSON list or a comma-separated string of field names."""
+    if isinstance(fields, str):
+        fields = fields.strip()
+        if fields.startswith("["):
+            try:
+                fields = frappe.parse_json(fields)
+            except ValueError:
+                frappe.throw(_("fields must be a JSON list or comma-separated names"), frappe.ValidationError)
+        else:
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+
+    if not isinstance(fields, list | tuple) or not all(isinstance(f, str) for f in fields):
+        frappe.throw(_("fields must be a list of field names"), frappe.ValidationError)
+
+    return list(fields)
+
+
+@frappe.whitelist()
+def list_users(cursor=None, limit=50, search=None, fields=None, with_total=1):
+    """Keyset-paginated enabled users, newest first.
+
+    Pass `next_cursor` from the previous page as `cursor`. `search`
+    matches a prefix of the email, first name or full name.
+    """
+    throw_if_not_admin()
+
+    limit = get_page_length(limit)
+
+    fields = _parse_fields(fields) if fields else DEFAULT_LIST_USER_FIELDS
+
+    invalid = set(fields) - set(LIST_USER_FIELDS)
+    if invalid:
+        frappe.throw(_("Invalid field(s): {0}").format(", ".join(sorted(invalid))))
+
+    selected = list(dict.fromkeys(["name", "creation", *fields]))
+
+    search = (search or "").strip()
+    conditions, values = get_user_list_conditions(search)
+
+    filter_conditions = " and ".join(conditions)
+
+    position = decode_cursor(cursor)
+    if position:
+        conditions.append(
+            "(`creation` < %(creation)s or (`creation` = %(creation)s and `name` < %(name)s))"
+        )
+        values.update({"creation": position[0], "name": position[1]})
+
+    users = frappe.db.sql(
+        f"""
+        select {", ".join(f"`{f}`" for f in selected)}
+        from `tabUser`
+        where {" and ".join(conditions)}
+        order by `creation` desc, `name` desc
+        limit {limit + 1}
+        """,
+        values,
+        as_dict=True
+    )
+
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1].creation, users[-1].name)
+
+    result = {"users": users, "next_cursor": next_cursor}
+
+    if cint(with_total) and not cursor:
+        result.update(_estimate_user_count(filter_conditions, values, search))
+
+    return result
+
+
+# ============================================================
+# 📤 EXPORT USERS (ADMIN ONLY, STREAMED)
+# ============================================================
+
+EXPORT_USER_FIELDS = ["name", "first_name", "last_name", "full_name", "user_type", "last_login", "creation"]
+
+
 @frappe.whitelist()
-def list_users():
+def export_users(format="csv", search=None):
+    """Stream the users list_users would return as a CSV / NDJSON download."""
     throw_if_not_admin()
 
-    return frappe.get_all(
-        "User",
-        filters={"enabled": 1},
-        fields=[
-            "name",
-            "first_name",
-            "last_name",
-            "enabled",
-            "creation"
-        ],
-        order_by="creation desc"
+    conditions, values = get_user_list_conditions((search or "").strip())
+
+    return exports.stream_export(
+        "users",
+        EXPORT_USER_FIELDS,
+        f"""
+        select {", ".join(f"`{f}`" for f in EXPORT_USER_FIELDS)}
+        from `tabUser`
+        where {" and ".join(conditions)}
+        order by `creation` desc, `name` desc
+        """,
+        values,
+        format
     )
 
 
@@ -98,39 +238,61 @@ def create_user(email=None, first_name=None, last_name=None, roles=None):
 
             user.add_roles(role)
 
-    # ---------------- Generate Reset Token ----------------
+    # ---------------- Queue Invitation ----------------
+    # the reset token is issued by the worker when the email is sent
 
-    token = random_string(48)
+    subject, message = invitations.render_invitation(first_name)
+    invitations.queue_invitation(email, subject, message, user=user.name)
+
+    commit()
+
+    return {"message": "User created and invitation queued successfully"}
 
-    frappe.db.set_value("User", user.name, {
-        "custom_reset_token": token,
-        "custom_reset_token_created_on": now_datetime()
-    })
 
-    # ---------------- Build React Reset Link ----------------
+# ============================================================
+# 📥 BULK CREATE USERS (CSV / JSONL)
+# ============================================================
+
+@frappe.whitelist(methods=["POST"])
+def bulk_create_users(data=None, file_format=None, send_invitations=1):
+    """Columns / keys: email, first_name, last_name, roles ("A;B" or list)."""
 
-    frontend_url = "http://localhost:3000/reset-password"
-    reset_link = f"{frontend_url}?token={token}"
+    throw_if_not_admin()
 
-    # ---------------- Send Email ----------------
+    if file_format not in (None, "csv", "jsonl"):
+        frappe.throw(_("Format must be csv or jsonl"))
 
-    frappe.sendmail(
-        recipients=email,
-        subject="Complete Your Registration",
-        message=f"""
-        <p>Hello {first_name},</p>
-        <p>Your account has been created.</p>
-        <p>Please click below to set your password:</p>
-        <p><a href="{reset_link}">{reset_link}</a></p>
-        """,
-        now=True,
-        header=None,
-        add_unsubscribe_link=0
+    stream, file_format = bulk_users.open_upload(data, file_format)
+
+    results = bulk_users.import_users(
+        bulk_users.iter_rows(stream, file_format),
+        send_invitations=cint(send_invitations)
     )
 
-    frappe.db.commit()
+    summary = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+
+    return {
+        "message": "Import finished",
+        "summary": summary,
+        "results": results
+    }
+
+
+# ============================================================
+# ✉️ INVITATION DELIVERY STATUS
+# ============================================================
+
+@frappe.whitelist()
+def get_invitation_status(emails=None, limit=100):
+
+    throw_if_not_admin()
+
+    if isinstance(emails, str):
+        emails = frappe.parse_json(emails) if emails.startswith("[") else [emails]
 
-    return {"message": "User created and invitation sent successfully"}
+    return invitations.get_status(emails, limit=min(int(limit or 100), 500))
 
 
 # ============================================================
@@ -157,7 +319,7 @@ def assign_role(user_email=None, role=None):
     user = frappe.get_doc("User", user_email)
     user.add_roles(role)
 
-    frappe.db.commit()
+    commit()
 
     return {"message": "Role assigned successfully"}
 
@@ -180,11 +342,151 @@ def remove_role(user_email=None, role=None):
     user = frappe.get_doc("User", user_email)
     user.remove_roles(role)
 
-    frappe.db.commit()
+    commit()
 
     return {"message": "Role removed successfully"}
 
 
+# ============================================================
+# 👥 SET USER ROLES (BULK, DIFF BASED)
+# ============================================================
+
+def _as_list(value):
+    if not value:
+        return []
+
+    if isinstance(value, str):
+        value = frappe.parse_json(value) if value.startswith("[") else [value]
+
+    return list(dict.fromkeys(value))
+
+
+@frappe.whitelist(methods=["POST"])
+def set_user_roles(users=None, add=None, remove=None):
+    """Add / remove roles for many users in one transaction.
+
+    Only the missing Has Role rows are inserted and only the existing
+    ones are deleted; users' role caches are dropped once at the end.
+    """
+
+    throw_if_not_admin()
+
+    users, add, remove = _as_list(users), _as_list(add), _as_list(remove)
+
+    if not users:
+        frappe.throw(_("Users are required"))
+
+    if not add and not remove:
+        frappe.throw(_("Nothing to change"))
+
+    if set(add) & set(remove):
+        frappe.throw(_("A role cannot be added and removed at the same time"))
+
+    if set(add + remove) & {"Administrator", "Guest", "All"}:
+        frappe.throw(_("Cannot assign system role"))
+
+    if frappe.session.user in users and "Company Admin" in remove:
+        frappe.throw(_("You cannot remove your own admin role"))
+
+    # ---------------- Validation (one query each) ----------------
+
+    existing_users = set(frappe.get_all(
+        "User", filters={"name": ["in", users]}, pluck="name"
+    ))
+    missing = [u for u in users if u not in existing_users]
+    if missing:
+        frappe.throw(_("User does not exist: {0}").format(", ".join(missing)))
+
+    roles = {
+        row.name: row.desk_access
+        for row in frappe.get_all(
+            "Role",
+            filters={"name": ["in", add + remove]},
+            fields=["name", "desk_access"]
+        )
+    }
+    missing = [r for r in add + remove if r not in roles]
+    if missing:
+        frappe.throw(_("Role does not exist: {0}").format(", ".join(missing)))
+
+    # ---------------- Diff against Has Role ----------------
+
+    current = frappe.db.sql(
+        """
+        select `name`, `parent`, `role`
+        from `tabHas Role`
+        where `parenttype` = 'User' and `parent` in %(users)s and `role` in %(roles)s
+        """,
+        {"users": users, "roles": add + remove},
+        as_dict=True
+    )
+    held = {(row.parent, row.role) for row in current}
+
+    to_delete = [row.name for row in current if row.role in remove]
+    to_insert = [(user, role) for user in users for role in add if (user, role) not in held]
+
+    # ---------------- Apply ----------------
+
+    if to_delete:
+        frappe.db.delete("Has Role", {"name": ["in", to_delete]})
+
+    if to_insert:
+        next_idx = dict(frappe.db.sql(
+            """
+            select `parent`, max(`idx`)
+            from `tabHas Role`
+            where `parenttype` = 'User' and `parent` in %(users)s
+            group by `parent`
+            """,
+            {"users": list({user for user, _role in to_insert})}
+        ))
+
+        now = now_datetime()
+        values = []
+        for user, role in to_insert:
+            next_idx[user] = (next_idx.get(user) or 0) + 1
+            values.append((
+                frappe.generate_hash(length=10), user, "User", "roles", role, next_idx[user],
+                now, now, frappe.session.user, frappe.session.user
+            ))
+
+        frappe.db.bulk_insert(
+            "Has Role",
+            fields=[
+                "name", "parent", "parenttype", "parentfield", "role", "idx",
+                "creation", "modified", "owner", "modified_by"
+            ],
+            values=values
+        )
+
+        # desk roles turn website users into system users (as User.validate does)
+        desk_users = list({user for user, role in to_insert if roles[role]})
+        if desk_users:
+            frappe.db.set_value(
+                "User",
+                {"name": ["in", desk_users], "user_type": "Website User"},
+                "user_type",
+                "System User"
+            )
+
+    deltas = {}
+    for row in current:
+        if row.role in remove:
+            deltas[row.role] = deltas.get(row.role, 0) - 1
+    for _user, role in to_insert:
+        deltas[role] = deltas.get(role, 0) + 1
+    role_usage.apply_deltas(deltas)
+
+    role_cache.invalidate(users)
+    commit()
+
+    return {
+        "message": "Roles updated successfully",
+        "added": len(to_insert),
+        "removed": len(to_delete)
+    }
+
+
 # ============================================================
 # 🔐 RESET PASSWORD FROM FRONTEND
 # ============================================================
@@ -198,35 +500,16 @@ def reset_password_from_frontend(token=None, new_password=None):
     if len(new_password) < 6:
         frappe.throw(_("Password must be at least 6 characters"))
 
-    user_data = frappe.get_all(
-        "User",
-        filters={"custom_reset_token": token},
-        fields=["name", "custom_reset_token_created_on"]
-    )
-
-    if not user_data:
-        frappe.throw(_("Invalid or expired reset link"))
-
-    user_name = user_data[0]["name"]
-    created_time = user_data[0]["custom_reset_token_created_on"]
-
-    if not created_time:
-        frappe.throw(_("Invalid or expired reset link"))
-
-    if now_datetime() > created_time + timedelta(minutes=20):
-        frappe.throw(_("Reset link expired"))
+    user_name = reset_tokens.validate_token(token)
 
     try:
         update_password(user_name, new_password)
     except Exception as e:
         frappe.throw(str(e))
 
-    frappe.db.set_value("User", user_name, {
-        "custom_reset_token": None,
-        "custom_reset_token_created_on": None
-    })
+    reset_tokens.revoke_user_tokens(user_name)
 
-    frappe.db.commit()
+    commit()
 
     return {"message": "Password updated successfully"}
 
@@ -243,5 +526,5 @@ def get_current_user_info():
 
     return {
         "email": frappe.session.user,
-        "roles": frappe.get_roles(frappe.session.user)
+        "roles": sorted(role_cache.get_roles(frappe.session.user))
     }
\ No newline at end of file
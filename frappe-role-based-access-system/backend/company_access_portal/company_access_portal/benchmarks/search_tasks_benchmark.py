@@ -0,0 +1,103 @@
+"""search_tasks (token index) against LIKE '%q%' over Company Task.
+
+Run on a development site only (it inserts and then deletes rows):
+
+    bench --site <site> execute \
+        company_access_portal.benchmarks.search_tasks_benchmark.run \
+        --kwargs "{'rows': 1000000}"
+"""
+
+import random
+import time
+
+import frappe
+from frappe.utils import add_to_date, now_datetime
+
+from company_access_portal import task_search
+from company_access_portal.api.task_api import search_task_page
+
+PREFIX = "BENCH-SEARCH-"
+WORDS = [
+    "invoice", "audit", "payroll", "deploy", "server", "report", "meeting", "client",
+    "budget", "review", "onboarding", "security", "backup", "migration", "contract",
+    "hiring", "training", "release", "database", "network", "support", "vendor",
+    "quarterly", "policy", "laptop", "license", "renewal", "feedback", "roadmap", "design"
+]
+QUERIES = ["payroll", "server migration", "quarterly budget review", "onbo"]
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _seed(rows, chunk=10000):
+    rng = random.Random(42)
+    start = now_datetime()
+    user = frappe.session.user
+
+    for offset in range(0, rows, chunk):
+        tasks, tokens = [], []
+
+        for i in range(offset, min(offset + chunk, rows)):
+            name = f"{PREFIX}{i:08d}"
+            title, description = _text(rng, 4), _text(rng, 12)
+            created = add_to_date(start, seconds=-i)
+
+            tasks.append((name, title, description, "Open", created, created, user, user))
+            tokens.extend(task_search.token_rows(name, title, description, now=created, user=user))
+
+        frappe.db.bulk_insert(
+            "Company Task",
+            fields=["name", "title", "description", "status", "creation", "modified", "owner", "modified_by"],
+            values=tasks
+        )
+        frappe.db.bulk_insert(task_search.TOKEN_DOCTYPE, fields=task_search.TOKEN_FIELDS, values=tokens)
+        frappe.db.commit()
+
+
+def _cleanup():
+    frappe.db.sql(
+        f"delete from `tab{task_search.TOKEN_DOCTYPE}` where `task` like %s", PREFIX + "%"
+    )
+    frappe.db.sql("delete from `tabCompany Task` where `name` like %s", PREFIX + "%")
+    frappe.db.commit()
+
+
+def _like_search(q, limit=20):
+    pattern = f"%{q}%"
+    return frappe.db.sql(
+        """
+        select `name`, `title`, `status`, `assigned_to`, `owner`, `modified`
+        from `tabCompany Task`
+        where `title` like %(q)s or `description` like %(q)s
+        order by `modified` desc
+        limit %(limit)s
+        """,
+        {"q": pattern, "limit": limit},
+        as_dict=True
+    )
+
+
+def _time(label, fn, repeat=10):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    print(f"{label:<45} {elapsed:9.2f} ms  ({len(result)} rows)")
+    return result
+
+
+def run(rows=1000000, keep=False):
+    _cleanup()
+    _seed(int(rows))
+
+    try:
+        print(f"Company Task search with {rows} tasks")
+
+        for q in QUERIES:
+            _time(f"search_tasks({q!r})", lambda: search_task_page("Administrator", q)["tasks"])
+            _time(f"LIKE '%{q}%'", lambda: _like_search(q), repeat=3)
+    finally:
+        if not keep:
+            _cleanup()
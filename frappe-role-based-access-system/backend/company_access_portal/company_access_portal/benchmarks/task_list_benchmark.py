@@ -0,0 +1,106 @@
+"""Company Task list latency for an If Owner employee as the table grows.
+
+Run on a development site only (it inserts and then deletes rows):
+
+    bench --site <site> execute \
+        company_access_portal.benchmarks.task_list_benchmark.run \
+        --kwargs "{'sizes': [10000, 100000, 1000000]}"
+
+The employee owns or is assigned the same 60 tasks at every size, so
+with the owner / assigned_to conditions and indexes the timings should
+stay flat while the table grows.
+"""
+
+import time
+
+import frappe
+from frappe.utils import add_to_date, now_datetime
+
+from company_access_portal.api.task_api import get_task_page
+
+PREFIX = "BENCH-LIST-"
+EMPLOYEE = "task-list-benchmark@example.com"
+OTHER_OWNER = "Administrator"
+EMPLOYEE_TASKS = 60
+
+
+def _ensure_employee():
+    if not frappe.db.exists("User", EMPLOYEE):
+        frappe.get_doc({
+            "doctype": "User",
+            "email": EMPLOYEE,
+            "first_name": "Benchmark",
+            "send_welcome_email": 0,
+            "roles": [{"role": "Company Employee"}]
+        }).insert(ignore_permissions=True)
+        frappe.db.commit()
+
+
+def _seed(start_index, end_index, every, chunk=10000):
+    start = now_datetime()
+
+    for offset in range(start_index, end_index, chunk):
+        values = []
+        for i in range(offset, min(offset + chunk, end_index)):
+            owner, assigned_to = OTHER_OWNER, None
+            if i % every == 0 and i // every < EMPLOYEE_TASKS:
+                if (i // every) % 2:
+                    owner = EMPLOYEE
+                else:
+                    assigned_to = EMPLOYEE
+
+            modified = add_to_date(start, seconds=-i)
+            values.append((
+                f"{PREFIX}{i:08d}", f"Benchmark task {i}", "Open", assigned_to,
+                modified, modified, owner, owner
+            ))
+
+        frappe.db.bulk_insert(
+            "Company Task",
+            fields=["name", "title", "status", "assigned_to", "creation", "modified", "owner", "modified_by"],
+            values=values
+        )
+        frappe.db.commit()
+
+
+def _cleanup():
+    frappe.db.sql("delete from `tabCompany Task` where `name` like %s", PREFIX + "%")
+    frappe.db.commit()
+
+
+def _time(label, fn, repeat=20):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    print(f"{label:<45} {elapsed:8.2f} ms  ({len(result)} rows)")
+
+
+def run(sizes=(10000, 100000, 1000000), keep=False):
+    _ensure_employee()
+    _cleanup()
+
+    sizes = sorted(int(s) for s in sizes)
+    # the employee's tasks are spread over the first (smallest) size;
+    # larger sizes only add other users' tasks
+    every = max(1, sizes[0] // EMPLOYEE_TASKS)
+
+    seeded = 0
+    try:
+        for size in sizes:
+            _seed(seeded, size, every)
+            seeded = size
+
+            frappe.set_user(EMPLOYEE)
+            try:
+                print(f"-- {size} tasks")
+                _time("get_task_page (first 20)", lambda: get_task_page(EMPLOYEE)["tasks"])
+                _time("frappe.get_list (first 20)", lambda: frappe.get_list(
+                    "Company Task", fields=["name", "title"], order_by="modified desc", limit=20
+                ))
+            finally:
+                frappe.set_user("Administrator")
+    finally:
+        if not keep:
+            _cleanup()
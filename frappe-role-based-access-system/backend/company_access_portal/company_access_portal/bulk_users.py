@@ -0,0 +1,280 @@
+import codecs
+import csv
+import io
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import now_datetime, validate_email_address
+
+from company_access_portal import invitations, role_cache, role_usage
+from company_access_portal.utils import commit
+
+# ============================================================
+# 📥 BULK USER ONBOARDING
+# ============================================================
+# Rows are read lazily from the upload (CSV with a header row, or one
+# JSON object per line) and processed CHUNK_SIZE at a time. Each chunk
+# is validated against pre-fetched sets, written with two multi-row
+# INSERTs (User, Has Role) and committed on its own.
+#
+# The fast path writes rows directly, so User controller hooks
+# (validate / on_update) are not run for imported users.
+
+CHUNK_SIZE = 500
+MAX_ROWS = 50000
+SYSTEM_ROLES = ["Administrator", "Guest", "All"]
+
+
+class InvalidRow:
+    """Yielded by iter_rows for a line that could not be parsed."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def iter_rows(stream, file_format):
+    """Yield dicts (or InvalidRow) from a text stream of CSV or JSONL."""
+    if file_format == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield InvalidRow(_("Invalid JSON: {0}").format(e))
+    else:
+        reader = csv.DictReader(stream)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                yield InvalidRow(_("Invalid CSV: {0}").format(e))
+                continue
+
+            yield row
+
+
+def iter_chunks(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def open_upload(data=None, file_format=None):
+    """Return ``(text_stream, format)`` for the request upload or `data`."""
+    upload = frappe.request.files.get("file") if frappe.request and frappe.request.files else None
+
+    if upload:
+        filename = (upload.filename or "").lower()
+        file_format = file_format or ("jsonl" if filename.endswith((".jsonl", ".ndjson")) else "csv")
+        # TextIOWrapper needs readable(), which SpooledTemporaryFile (used by
+        # werkzeug for larger uploads) lacks before Python 3.11
+        return codecs.getreader("utf-8-sig")(upload.stream), file_format
+
+    if not data:
+        frappe.throw(_("Upload a CSV / JSONL file or pass data"))
+
+    return io.StringIO(data, newline=""), file_format or "csv"
+
+
+def parse_roles(value):
+    if not value:
+        return []
+
+    if isinstance(value, str):
+        value = value.replace(";", ",").split(",")
+
+    if not isinstance(value, list) or not all(isinstance(role, str) for role in value):
+        raise ValueError(_("roles must be a string or a list of strings"))
+
+    return [role.strip() for role in value if role.strip()]
+
+
+def _text(row, field):
+    value = row.get(field)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(_("{0} must be a string").format(field))
+    return value.strip()
+
+
+def _row_error(row):
+    """``(error, email, roles)`` for a row before the database checks."""
+    if isinstance(row, InvalidRow):
+        return row.error, "", []
+
+    if not isinstance(row, dict):
+        return _("Row must be an object"), "", []
+
+    try:
+        email = _text(row, "email").lower()
+        roles = parse_roles(row.get("roles"))
+        _text(row, "first_name")
+        _text(row, "last_name")
+    except ValueError as e:
+        return str(e), "", []
+
+    if not email or not validate_email_address(email, throw=False):
+        return _("Invalid email address"), email, roles
+
+    return None, email, roles
+
+
+def _fetch_roles():
+    """Assignable roles mapped to their desk_access flag (one query)."""
+    return {
+        row.name: row.desk_access
+        for row in frappe.get_all(
+            "Role",
+            filters={"name": ["not in", SYSTEM_ROLES], "disabled": 0},
+            fields=["name", "desk_access"]
+        )
+    }
+
+
+def _user_values(email, first_name, last_name, user_type, now):
+    user = frappe.new_doc("User")
+    user.update({
+        "name": email,
+        "email": email,
+        "first_name": first_name,
+        "last_name": last_name,
+        "full_name": " ".join(filter(None, [first_name, last_name])),
+        "enabled": 1,
+        "send_welcome_email": 0,
+        "user_type": user_type,
+        "creation": now,
+        "modified": now,
+        "owner": frappe.session.user,
+        "modified_by": frappe.session.user
+    })
+    return user.get_valid_dict(convert_dates_to_str=True)
+
+
+def import_users(rows, send_invitations=True):
+    """Create users from an iterable of row dicts, returning one result per row.
+
+    Unparsable rows are reported as errors and never abort the import.
+    Reading stops after MAX_ROWS rows with a single "truncated" error.
+    """
+    assignable_roles = _fetch_roles()
+    seen = set()
+    results = []
+    row_number = 0
+    truncated = False
+
+    for chunk in iter_chunks(rows):
+        # ---------------- Validation ----------------
+
+        valid = []
+        for row in chunk:
+            row_number += 1
+
+            if row_number > MAX_ROWS:
+                results.append({
+                    "row": row_number, "email": "", "status": "error",
+                    "message": _("Upload truncated at {0} rows; the remaining rows were not imported").format(MAX_ROWS)
+                })
+                truncated = True
+                break
+
+            error, email, roles = _row_error(row)
+            if not error:
+                if email in seen:
+                    error = _("Duplicate email in upload")
+                else:
+                    unknown = [role for role in roles if role not in assignable_roles]
+                    if unknown:
+                        error = _("Unknown role(s): {0}").format(", ".join(unknown))
+
+            if error:
+                results.append({"row": row_number, "email": email, "status": "error", "message": error})
+            else:
+                # only rows that passed make a later row a duplicate
+                seen.add(email)
+                valid.append((row_number, email, row, roles))
+
+        existing = set(frappe.get_all(
+            "User",
+            filters={"name": ["in", [v[1] for v in valid]]},
+            pluck="name"
+        )) if valid else set()
+
+        # ---------------- Build Rows ----------------
+
+        now = now_datetime()
+        user_rows, role_rows, created, first_names = [], [], [], {}
+
+        for number, email, row, roles in valid:
+            if email in existing:
+                results.append({
+                    "row": number, "email": email, "status": "skipped",
+                    "message": _("User already exists")
+                })
+                continue
+
+            first_name = _text(row, "first_name") or email.split("@")[0]
+            last_name = _text(row, "last_name")
+            user_type = "System User" if any(assignable_roles[r] for r in roles) else "Website User"
+            user_rows.append(_user_values(email, first_name, last_name, user_type, now))
+
+            for idx, role in enumerate(dict.fromkeys(roles), start=1):
+                role_rows.append((
+                    frappe.generate_hash(length=10), email, "User", "roles", role, idx,
+                    now, now, frappe.session.user, frappe.session.user
+                ))
+
+            first_names[email] = first_name
+            created.append(email)
+            results.append({"row": number, "email": email, "status": "created"})
+
+        # ---------------- Write (one transaction per chunk) ----------------
+
+        if user_rows:
+            fields = list(user_rows[0])
+            frappe.db.bulk_insert("User", fields=fields, values=[[r.get(f) for f in fields] for r in user_rows])
+
+        if role_rows:
+            frappe.db.bulk_insert(
+                "Has Role",
+                fields=[
+                    "name", "parent", "parenttype", "parentfield", "role", "idx",
+                    "creation", "modified", "owner", "modified_by"
+                ],
+                values=role_rows
+            )
+
+        if send_invitations and created:
+            invites = []
+            for email in created:
+                subject, message = invitations.render_invitation(first_names[email])
+                invites.append({"email": email, "user": email, "subject": subject, "message": message})
+
+            invitations.queue_invitations(invites)
+
+        if created:
+            role_cache.invalidate(created)
+
+            deltas = {}
+            for row in role_rows:
+                deltas[row[4]] = deltas.get(row[4], 0) + 1
+            role_usage.apply_deltas(deltas)
+
+        commit()
+
+        if truncated:
+            break
+
+    return results
@@ -0,0 +1,89 @@
+import frappe
+
+from company_access_portal.utils import bump_version, get_version
+
+# ============================================================
+# 📚 COMPANY ACCESS DOCTYPE CATALOG
+# ============================================================
+# The module → doctypes catalog only changes on migrate or DocType
+# save, so it is built once, kept in Redis and in each worker, and
+# tagged with the "catalog" version counter. DocType hooks and
+# after_migrate bump the counter.
+
+MODULE = "Company Access"
+CATALOG_VERSION = "catalog"
+REDIS_KEY = "company_access_portal:catalog"
+
+# bookkeeping doctypes of this app, never shown on the permission screens
+INTERNAL_DOCTYPES = {
+    "Company Invitation",
+    "Company Reset Token",
+    "Company Role Usage",
+    "Company Task Search Token",
+    "Company Task Archive",
+    "Company Task Summary",
+    "Company Task Tombstone",
+}
+
+_local_catalog = {}
+
+
+def build_catalog():
+    rows = frappe.get_all(
+        "DocType",
+        filters={"module": MODULE},
+        fields=["name", "module", "istable", "issingle"],
+        order_by="name asc"
+    )
+
+    editable = [
+        row.name for row in rows
+        if not row.istable and not row.issingle and row.name not in INTERNAL_DOCTYPES
+    ]
+
+    return {
+        # every doctype of the module, used for `parent in [...]` filters
+        "all_doctypes": [row.name for row in rows],
+        # doctypes whose permissions are managed from the portal
+        "doctypes": editable,
+        "modules": {MODULE: editable} if editable else {}
+    }
+
+
+def get_catalog():
+    version = get_version(CATALOG_VERSION)
+    key = frappe.local.site
+
+    entry = _local_catalog.get(key)
+    if entry and entry[0] == version:
+        return entry[1]
+
+    cached = frappe.cache().get_value(REDIS_KEY)
+    if cached and cached.get("version") == version:
+        catalog = cached["catalog"]
+    else:
+        catalog = build_catalog()
+        frappe.cache().set_value(REDIS_KEY, {"version": version, "catalog": catalog})
+
+    _local_catalog[key] = (version, catalog)
+    return catalog
+
+
+def invalidate():
+    _local_catalog.pop(frappe.local.site, None)
+    frappe.cache().delete_value(REDIS_KEY)
+    bump_version(CATALOG_VERSION)
+
+
+# ============================================================
+# 🔔 HOOKS (wired in hooks.py)
+# ============================================================
+
+def on_doctype_change(doc, method=None):
+    invalidate()
+
+
+def warm():
+    """after_migrate: rebuild the catalog so the first request is warm."""
+    invalidate()
+    get_catalog()
@@ -1,9 +1,85 @@
 # Copyright (c) 2026, udayp and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from company_access_portal import permission_evaluator, task_sync
+
+# If Owner rights also apply to the assignee, limited to these
+ASSIGNEE_PERMISSIONS = permission_evaluator.PERMISSION_BITS["read"] | permission_evaluator.PERMISSION_BITS["write"]
+
 
 class CompanyTask(Document):
-	pass
+	def on_update(self):
+		self.sync_assignee_share()
+
+	def sync_assignee_share(self):
+		# Frappe only applies If Owner rows to the owner; sharing the task
+		# with its assignee lets the has_permission hook below decide.
+		before = self.get_doc_before_save()
+		previous = before.assigned_to if before else None
+
+		if previous == self.assigned_to:
+			return
+
+		flags = {"ignore_share_permission": True}
+
+		if previous and previous != self.owner:
+			frappe.share.remove(self.doctype, self.name, previous, flags=flags)
+			# the previous assignee's synced clients must drop the task
+			task_sync.record_tombstone(self.name, self.owner, previous)
+
+		if self.assigned_to and self.assigned_to != self.owner:
+			frappe.share.add_docshare(
+				self.doctype, self.name, self.assigned_to, read=1, write=1, notify=0, flags=flags
+			)
+
+
+def get_permission_query_conditions(user=None):
+	"""SQL condition limiting Company Task rows to what `user` may read.
+
+	Registered in hooks.py, so Frappe's list views and /api/resource use
+	it too. The owner / assigned_to branches are served by the
+	(owner, modified) and (assigned_to, modified) indexes.
+	"""
+	return get_read_conditions(user)
+
+
+def get_read_conditions(user=None, table="tabCompany Task"):
+	"""The read condition for `table` (Company Task or its archive)."""
+	user = user or frappe.session.user
+	mask, owner_mask = permission_evaluator.get_masks("Company Task", user)
+	read = permission_evaluator.PERMISSION_BITS["read"]
+
+	if mask & read:
+		return ""
+
+	if owner_mask & read:
+		user = frappe.db.escape(user)
+		return f"(`{table}`.`owner` = {user} or `{table}`.`assigned_to` = {user})"
+
+	return "1=0"
+
+
+def get_doc_mask(doc, user=None):
+	"""Rights of `user` on one Company Task as a permission bitmask."""
+	user = user or frappe.session.user
+	mask, owner_mask = permission_evaluator.get_masks("Company Task", user)
+
+	# a task being created belongs to the user creating it
+	if (doc.get("owner") or user) == user:
+		return mask | owner_mask
+
+	if doc.get("assigned_to") == user:
+		return mask | (owner_mask & ASSIGNEE_PERMISSIONS)
+
+	return mask
+
+
+def has_permission(doc, ptype=None, user=None, debug=False):
+	bit = permission_evaluator.PERMISSION_BITS.get(ptype or "read")
+	if not bit:
+		return True
+
+	return bool(get_doc_mask(doc, user) & bit)
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, udayp and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Company Task Summary", {
+// 	refresh(frm) {
+
+// 	},
+// });
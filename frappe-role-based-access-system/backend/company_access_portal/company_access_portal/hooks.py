@@ -91,6 +91,11 @@ app_license = "mit"
 # before_uninstall = "company_access_portal.uninstall.before_uninstall"
 # after_uninstall = "company_access_portal.uninstall.after_uninstall"
 
+# Migration
+# ------------
+
+after_migrate = ["company_access_portal.catalog.warm"]
+
 # Integration Setup
 # ------------------
 # To set up dependencies/integrations with other apps
@@ -125,6 +130,14 @@ app_license = "mit"
 # 	"Event": "frappe.desk.doctype.event.event.has_permission",
 # }
 
+permission_query_conditions = {
+	"Company Task": "company_access_portal.company_access.doctype.company_task.company_task.get_permission_query_conditions",
+}
+
+has_permission = {
+	"Company Task": "company_access_portal.company_access.doctype.company_task.company_task.has_permission",
+}
+
 # DocType Class
 # ---------------
 # Override standard doctype classes
@@ -145,6 +158,69 @@ app_license = "mit"
 # 	}
 # }
 
+doc_events = {
+	"User": {
+		"on_update": [
+			"company_access_portal.role_cache.on_user_change",
+			"company_access_portal.role_usage.on_user_update",
+		],
+		"on_trash": [
+			"company_access_portal.role_cache.on_user_change",
+			"company_access_portal.role_usage.on_user_trash",
+		],
+	},
+	"Has Role": {
+		"after_insert": [
+			"company_access_portal.role_cache.on_has_role_change",
+			"company_access_portal.role_usage.on_has_role_insert",
+		],
+		"on_update": "company_access_portal.role_cache.on_has_role_change",
+		"on_trash": [
+			"company_access_portal.role_cache.on_has_role_change",
+			"company_access_portal.role_usage.on_has_role_trash",
+		],
+	},
+	"Role": {
+		"on_update": "company_access_portal.role_cache.on_role_change",
+		"on_trash": [
+			"company_access_portal.role_cache.on_role_change",
+			"company_access_portal.role_usage.on_role_trash",
+		],
+	},
+	"DocType": {
+		"on_update": [
+			"company_access_portal.permission_evaluator.on_doctype_change",
+			"company_access_portal.catalog.on_doctype_change",
+		],
+		"on_trash": "company_access_portal.catalog.on_doctype_change",
+	},
+	"Company Task": {
+		"after_insert": [
+			"company_access_portal.task_realtime.on_task_update",
+			"company_access_portal.task_summary.on_task_insert",
+		],
+		"on_update": [
+			"company_access_portal.task_realtime.on_task_update",
+			"company_access_portal.task_summary.on_task_update",
+			"company_access_portal.task_search.on_task_update",
+		],
+		"on_trash": [
+			"company_access_portal.task_sync.on_task_trash",
+			"company_access_portal.task_realtime.on_task_trash",
+			"company_access_portal.task_summary.on_task_trash",
+			"company_access_portal.task_search.on_task_trash",
+		],
+		"after_rename": [
+			"company_access_portal.task_sync.on_task_rename",
+			"company_access_portal.task_search.on_task_rename",
+		],
+	},
+	"Custom DocPerm": {
+		"on_update": "company_access_portal.permission_evaluator.on_permission_row_change",
+		"on_trash": "company_access_portal.permission_evaluator.on_permission_row_change",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -166,6 +242,21 @@ app_license = "mit"
 # 	],
 # }
 
+scheduler_events = {
+	"all": [
+		"company_access_portal.invitations.enqueue_sender",
+	],
+	"hourly": [
+		"company_access_portal.reset_tokens.purge_expired_tokens",
+	],
+	"daily": [
+		"company_access_portal.role_usage.reconcile",
+		"company_access_portal.task_archive.archive_completed_tasks",
+		"company_access_portal.task_sync.purge_tombstones",
+		"company_access_portal.task_summary.reconcile",
+	],
+}
+
 # Testing
 # -------
 
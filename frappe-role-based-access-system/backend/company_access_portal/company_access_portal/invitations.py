@@ -0,0 +1,313 @@
+import smtplib
+from datetime import timedelta
+from email.message import EmailMessage
+from email.utils import make_msgid
+
+import frappe
+from frappe.utils import add_to_date, now_datetime
+from frappe.utils.data import cint
+
+from company_access_portal import reset_tokens
+
+# ============================================================
+# ✉️ INVITATION QUEUE
+# ============================================================
+# create_user() only records a "Company Invitation" row and returns.
+# A background job drains the queue in batches over one SMTP
+# connection. Failed sends are retried with exponential backoff and
+# moved to "Dead" after MAX_ATTEMPTS.
+#
+# SMTP settings come from `invitation_smtp` in site_config.json, e.g.
+#   {"host": "127.0.0.1", "port": 1025, "sender": "portal@example.com"}
+# (handy with `python -m aiosmtpd -n -l 127.0.0.1:1025`); otherwise the
+# default outgoing Email Account is used.
+#
+# Rows never hold a reset token: the message keeps RESET_LINK_PLACEHOLDER
+# and the worker issues a fresh token for `user` on every send attempt,
+# so a retried invitation never carries an expired (or stored) link.
+
+INVITATION_DOCTYPE = "Company Invitation"
+JOB_ID = "company_access_portal:send_invitations"
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 60
+
+
+RESET_PASSWORD_URL = "http://localhost:3000/reset-password"
+RESET_LINK_PLACEHOLDER = "{reset_link}"
+
+
+def render_invitation(first_name):
+    """Return ``(subject, message)`` for a new account invitation.
+
+    The message contains RESET_LINK_PLACEHOLDER, filled in by get_message()
+    when the invitation is sent.
+    """
+    return "Complete Your Registration", f"""
+        <p>Hello {first_name},</p>
+        <p>Your account has been created.</p>
+        <p>Please click below to set your password:</p>
+        <p><a href="{RESET_LINK_PLACEHOLDER}">{RESET_LINK_PLACEHOLDER}</a></p>
+        """
+
+
+def get_message(row):
+    """The message of `row` with a reset link for a freshly issued token."""
+    if not row.user or RESET_LINK_PLACEHOLDER not in (row.message or ""):
+        return row.message
+
+    token = reset_tokens.issue_token(row.user)
+    return row.message.replace(RESET_LINK_PLACEHOLDER, f"{RESET_PASSWORD_URL}?token={token}")
+
+
+def queue_invitation(email, subject, message, user=None):
+    invitation = frappe.get_doc({
+        "doctype": INVITATION_DOCTYPE,
+        "email": email,
+        "user": user,
+        "subject": subject,
+        "message": message,
+        "status": "Queued",
+        "next_attempt_on": now_datetime()
+    })
+    invitation.insert(ignore_permissions=True)
+
+    enqueue_sender()
+
+    return invitation.name
+
+
+def queue_invitations(rows):
+    """Bulk variant of queue_invitation for dicts of email/user/subject/message."""
+    if not rows:
+        return
+
+    now = now_datetime()
+    owner = frappe.session.user
+
+    frappe.db.bulk_insert(
+        INVITATION_DOCTYPE,
+        fields=[
+            "name", "email", "user", "subject", "message", "status",
+            "attempts", "next_attempt_on", "creation", "modified", "owner", "modified_by"
+        ],
+        values=[
+            (
+                frappe.generate_hash(), row["email"], row.get("user"), row["subject"],
+                row["message"], "Queued", 0, now, now, now, owner, owner
+            )
+            for row in rows
+        ]
+    )
+
+    enqueue_sender()
+
+
+def enqueue_sender():
+    frappe.enqueue(
+        "company_access_portal.invitations.send_queued_invitations",
+        queue="short",
+        job_id=JOB_ID,
+        deduplicate=True,
+        enqueue_after_commit=True
+    )
+
+
+# ============================================================
+# 📮 SMTP
+# ============================================================
+
+class SMTPConnection:
+    """One SMTP session reused for a whole batch, reopened on disconnect."""
+
+    def __init__(self):
+        self.config = frappe.conf.get("invitation_smtp") or {}
+        self.session = None
+        self.sender = None
+
+    def open(self):
+        if self.config:
+            config = frappe._dict(self.config)
+            port = cint(config.port) or 25
+
+            if cint(config.use_ssl):
+                session = smtplib.SMTP_SSL(config.host, port, timeout=30)
+            else:
+                session = smtplib.SMTP(config.host, port, timeout=30)
+                if cint(config.use_tls):
+                    session.starttls()
+
+            if config.username:
+                session.login(config.username, config.password)
+
+            self.session = session
+            self.sender = config.sender or config.username or f"noreply@{config.host}"
+        else:
+            from frappe.email.doctype.email_account.email_account import EmailAccount
+
+            account = EmailAccount.find_outgoing(_raise_error=True)
+            self.session = account.get_smtp_server().session
+            self.sender = account.default_sender
+
+        return self
+
+    def send(self, recipient, subject, html):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message["Message-Id"] = make_msgid()
+        message.set_content(html, subtype="html")
+
+        try:
+            self.session.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self.open()
+            self.session.send_message(message)
+
+    def close(self):
+        if self.session:
+            try:
+                self.session.quit()
+            except smtplib.SMTPException:
+                pass
+            self.session = None
+
+
+# ============================================================
+# 🔁 WORKER
+# ============================================================
+
+def _claim_batch(batch_size):
+    names = frappe.get_all(
+        INVITATION_DOCTYPE,
+        filters={
+            "status": "Queued",
+            "next_attempt_on": ["<=", now_datetime()]
+        },
+        order_by="next_attempt_on asc",
+        limit=batch_size,
+        pluck="name"
+    )
+
+    if names:
+        frappe.db.set_value(
+            INVITATION_DOCTYPE,
+            {"name": ["in", names], "status": "Queued"},
+            "status",
+            "Sending"
+        )
+        frappe.db.commit()
+
+    return names
+
+
+def _record_failure(row, error):
+    attempts = cint(row.attempts) + 1
+
+    values = {"attempts": attempts, "last_error": str(error)[:1000]}
+
+    if attempts >= MAX_ATTEMPTS:
+        values.update({"status": "Dead", "next_attempt_on": None})
+    else:
+        values.update({
+            "status": "Queued",
+            "next_attempt_on": add_to_date(
+                now_datetime(), seconds=BACKOFF_SECONDS * 2 ** (attempts - 1)
+            )
+        })
+
+    frappe.db.set_value(INVITATION_DOCTYPE, row.name, values)
+
+
+def send_queued_invitations(batch_size=BATCH_SIZE):
+    """Send every due invitation, `batch_size` rows per transaction.
+
+    Runs as a single deduplicated job (see enqueue_sender); the
+    scheduler re-enqueues it so backed-off retries get picked up.
+    """
+    release_stale_claims()
+
+    connection = None
+
+    try:
+        while True:
+            names = _claim_batch(batch_size)
+            if not names:
+                break
+
+            rows = frappe.get_all(
+                INVITATION_DOCTYPE,
+                filters={"name": ["in", names]},
+                fields=["name", "email", "user", "subject", "message", "attempts"]
+            )
+
+            if connection is None:
+                try:
+                    connection = SMTPConnection().open()
+                except Exception as e:
+                    for row in rows:
+                        _record_failure(row, e)
+                    frappe.db.commit()
+                    break
+
+            for row in rows:
+                try:
+                    connection.send(row.email, row.subject, get_message(row))
+                except Exception as e:
+                    _record_failure(row, e)
+                else:
+                    frappe.db.set_value(INVITATION_DOCTYPE, row.name, {
+                        "status": "Sent",
+                        "sent_on": now_datetime(),
+                        "attempts": cint(row.attempts) + 1,
+                        "next_attempt_on": None,
+                        "last_error": None
+                    })
+
+            frappe.db.commit()
+    finally:
+        if connection:
+            connection.close()
+
+
+def release_stale_claims(minutes=15):
+    # rows left in "Sending" by a worker that died mid-batch
+    frappe.db.set_value(
+        INVITATION_DOCTYPE,
+        {
+            "status": "Sending",
+            "modified": ["<", now_datetime() - timedelta(minutes=minutes)]
+        },
+        "status",
+        "Queued"
+    )
+
+
+# ============================================================
+# 📊 STATUS
+# ============================================================
+
+def get_status(emails=None, limit=100):
+    filters = {}
+    if emails:
+        filters["email"] = ["in", emails]
+
+    return frappe.get_all(
+        INVITATION_DOCTYPE,
+        filters=filters,
+        fields=[
+            "name",
+            "email",
+            "user",
+            "status",
+            "attempts",
+            "next_attempt_on",
+            "sent_on",
+            "last_error",
+            "creation"
+        ],
+        order_by="creation desc",
+        limit=limit
+    )
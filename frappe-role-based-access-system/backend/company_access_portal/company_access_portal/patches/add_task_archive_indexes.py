@@ -0,0 +1,11 @@
+import frappe
+
+
+def execute():
+    # task_archive.archive_completed_tasks: status = 'Completed' and modified < ? order by modified
+    frappe.db.add_index("Company Task", ["status", "modified"], "status_modified_index")
+
+    # list_tasks / search_tasks / export_tasks with include_archived=1 read the
+    # archive with the same owner / assigned_to conditions as the hot table
+    frappe.db.add_index("Company Task Archive", ["owner", "modified"], "owner_modified_index")
+    frappe.db.add_index("Company Task Archive", ["assigned_to", "modified"], "assigned_to_modified_index")
@@ -0,0 +1,20 @@
+import frappe
+
+
+def execute():
+    # get_permission_query_conditions: (owner = ? or assigned_to = ?) order by modified desc;
+    # MariaDB merges the two index ranges instead of scanning the table
+    frappe.db.add_index("Company Task", ["owner", "modified"], "owner_modified_index")
+    frappe.db.add_index("Company Task", ["assigned_to", "modified"], "assigned_to_modified_index")
+
+    # tasks assigned before the assignee share existed (see CompanyTask.sync_assignee_share)
+    for name, assigned_to in frappe.db.sql(
+        """
+        select `name`, `assigned_to` from `tabCompany Task`
+        where ifnull(`assigned_to`, '') != '' and `assigned_to` != `owner`
+        """
+    ):
+        frappe.share.add_docshare(
+            "Company Task", name, assigned_to, read=1, write=1, notify=0,
+            flags={"ignore_share_permission": True}
+        )
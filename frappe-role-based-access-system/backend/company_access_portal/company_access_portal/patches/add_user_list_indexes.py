@@ -0,0 +1,10 @@
+import frappe
+
+
+def execute():
+    # keyset pagination in user_api.list_users: enabled = 1 order by creation, name
+    frappe.db.add_index("User", ["enabled", "creation", "name"], "enabled_creation_name_index")
+
+    # prefix search (email prefix is served by the primary key)
+    frappe.db.add_index("User", ["first_name"], "first_name_index")
+    frappe.db.add_index("User", ["full_name"], "full_name_index")
@@ -0,0 +1,5 @@
+from company_access_portal import role_usage
+
+
+def execute():
+    role_usage.rebuild()
@@ -0,0 +1,10 @@
+import frappe
+
+from company_access_portal import task_search
+
+
+def execute():
+    # search_task_page: token = ? / token like 'q%' → (task, weight) without a row lookup
+    frappe.db.add_index(task_search.TOKEN_DOCTYPE, ["token", "task", "weight"], "token_task_weight_index")
+
+    task_search.rebuild()
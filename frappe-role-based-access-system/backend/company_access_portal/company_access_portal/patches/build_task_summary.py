@@ -0,0 +1,5 @@
+from company_access_portal import task_summary
+
+
+def execute():
+    task_summary.rebuild()
@@ -0,0 +1,173 @@
+import frappe
+from frappe.utils.data import cint
+
+from company_access_portal import role_cache
+from company_access_portal.utils import bump_version_after_commit, get_version
+
+# ============================================================
+# 🧮 COMPILED PERMISSION EVALUATOR
+# ============================================================
+# The DocPerm table of a doctype is compiled into one bitmask per
+# role. A user's capability on that doctype is the OR of the masks of
+# their roles; rows marked `if_owner` go into a separate mask that only
+# applies to documents the user owns.
+#
+# Each compiled doctype is tagged with its own version counter, bumped
+# by role_api.on_permissions_changed(), so editing one DocPerm row only
+# recompiles that doctype.
+
+PERMISSION_BITS = {
+    ptype: 1 << index
+    for index, ptype in enumerate([
+        "read", "write", "create", "delete", "submit", "cancel", "amend",
+        "report", "export", "import", "share", "print", "email", "select"
+    ])
+}
+
+ALL_PERMISSIONS = sum(PERMISSION_BITS.values())
+
+# bumped on any permission change, next to the per-doctype counters
+PERMISSION_VERSION = "permissions"
+
+_compiled = {}
+
+
+def doctype_version_key(doctype):
+    return f"permissions:{doctype}"
+
+
+def mask_to_ptypes(mask):
+    return [ptype for ptype, bit in PERMISSION_BITS.items() if mask & bit]
+
+
+def _load_rows(doctype):
+    # Frappe ignores DocPerm for a doctype once it has Custom DocPerm rows
+    columns = ", ".join(f"`{ptype}`" for ptype in PERMISSION_BITS)
+
+    for perm_doctype in ("Custom DocPerm", "DocPerm"):
+        rows = frappe.db.sql(
+            f"""
+            select `role`, `if_owner`, {columns}
+            from `tab{perm_doctype}`
+            where `parent` = %s and `permlevel` = 0
+            """,
+            doctype,
+            as_dict=True
+        )
+        if rows:
+            return rows
+
+    return []
+
+
+def compile_doctype(doctype):
+    """Return ``{role: (mask, owner_mask)}`` for `doctype`."""
+    compiled = {}
+
+    for row in _load_rows(doctype):
+        mask = 0
+        for ptype, bit in PERMISSION_BITS.items():
+            if cint(row.get(ptype)):
+                mask |= bit
+
+        full, owner_only = compiled.get(row.role, (0, 0))
+        if cint(row.if_owner):
+            owner_only |= mask
+        else:
+            full |= mask
+
+        compiled[row.role] = (full, owner_only)
+
+    return compiled
+
+
+def get_compiled(doctype):
+    version = get_version(doctype_version_key(doctype))
+    key = (frappe.local.site, doctype)
+
+    entry = _compiled.get(key)
+    if not entry or entry[0] != version:
+        entry = (version, compile_doctype(doctype))
+        _compiled[key] = entry
+
+    return entry[1]
+
+
+def get_masks(doctype, user=None):
+    """Return ``(mask, owner_mask)`` for `user` on `doctype`.
+
+    `mask` holds rights granted on every document, `owner_mask` the
+    rights that only apply to documents owned by the user.
+    """
+    user = user or frappe.session.user
+
+    if user == "Administrator":
+        return ALL_PERMISSIONS, 0
+
+    compiled = get_compiled(doctype)
+    mask = owner_mask = 0
+
+    for role in role_cache.get_roles(user):
+        full, owner_only = compiled.get(role, (0, 0))
+        mask |= full
+        owner_mask |= owner_only
+
+    return mask, owner_mask & ~mask
+
+
+def can(user, doctype, ptype, doc=None):
+    bit = PERMISSION_BITS.get(ptype)
+    if not bit:
+        return False
+
+    mask, owner_mask = get_masks(doctype, user)
+
+    if mask & bit:
+        return True
+
+    if not owner_mask & bit:
+        return False
+
+    # doctype-level check: owner rights are enough to list / create
+    if doc is None:
+        return True
+
+    owner = doc.get("owner") if isinstance(doc, dict) else doc.owner
+    return owner == (user or frappe.session.user)
+
+
+def invalidate(doctypes):
+    """Recompile `doctypes` in every worker.
+
+    Versions are bumped now and again after commit (bump_version_after_commit),
+    so masks compiled from the old rows before our commit cannot stay cached.
+    """
+    doctypes = set(doctypes)
+    _drop_local(doctypes)
+
+    for doctype in doctypes:
+        bump_version_after_commit(doctype_version_key(doctype))
+
+    bump_version_after_commit(PERMISSION_VERSION)
+
+    if getattr(frappe.db, "after_commit", None) is not None:
+        frappe.db.after_commit.add(lambda: _drop_local(doctypes))
+
+
+def _drop_local(doctypes):
+    for doctype in doctypes:
+        _compiled.pop((frappe.local.site, doctype), None)
+
+
+# ============================================================
+# 🔔 DOC EVENTS (wired in hooks.py)
+# ============================================================
+
+def on_permission_row_change(doc, method=None):
+    # DocPerm / Custom DocPerm edited from Desk (Role Permission Manager)
+    if doc.parent:
+        invalidate([doc.parent])
+
+
+def on_doctype_change(doc, method=None):
+    invalidate([doc.name])
@@ -0,0 +1,84 @@
+import hashlib
+import hmac
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, now_datetime, random_string
+
+# ============================================================
+# 🔑 PASSWORD RESET TOKENS
+# ============================================================
+# Tokens are never stored in clear text: the row name (primary key) of
+# "Company Reset Token" is the SHA-256 of the token, so a lookup is a
+# single primary-key read. Expired rows are purged by the scheduler.
+
+TOKEN_DOCTYPE = "Company Reset Token"
+TOKEN_TTL_MINUTES = 20
+PURGE_BATCH_SIZE = 1000
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_tokens(users, minutes=TOKEN_TTL_MINUTES):
+    """Create one token per user in a single INSERT, returning ``{user: token}``."""
+    now = now_datetime()
+    expires_on = add_to_date(now, minutes=minutes)
+    owner = frappe.session.user
+
+    tokens = {user: random_string(48) for user in users}
+
+    if tokens:
+        frappe.db.bulk_insert(
+            TOKEN_DOCTYPE,
+            fields=["name", "user", "expires_on", "creation", "modified", "owner", "modified_by"],
+            values=[
+                (hash_token(token), user, expires_on, now, now, owner, owner)
+                for user, token in tokens.items()
+            ]
+        )
+
+    return tokens
+
+
+def issue_token(user, minutes=TOKEN_TTL_MINUTES):
+    return issue_tokens([user], minutes)[user]
+
+
+def validate_token(token):
+    """Return the user a valid token belongs to, or throw."""
+    token_hash = hash_token(token)
+
+    row = frappe.db.get_value(
+        TOKEN_DOCTYPE, token_hash, ["name", "user", "expires_on"], as_dict=True
+    )
+
+    if not row or not hmac.compare_digest(row.name, token_hash):
+        frappe.throw(_("Invalid or expired reset link"))
+
+    if now_datetime() > row.expires_on:
+        frappe.throw(_("Reset link expired"))
+
+    return row.user
+
+
+def revoke_user_tokens(user):
+    frappe.db.delete(TOKEN_DOCTYPE, {"user": user})
+
+
+def purge_expired_tokens():
+    """Scheduler job: delete expired tokens PURGE_BATCH_SIZE rows at a time."""
+    while True:
+        names = frappe.get_all(
+            TOKEN_DOCTYPE,
+            filters={"expires_on": ["<", now_datetime()]},
+            limit=PURGE_BATCH_SIZE,
+            pluck="name"
+        )
+
+        if not names:
+            break
+
+        frappe.db.delete(TOKEN_DOCTYPE, {"name": ["in", names]})
+        frappe.db.commit()
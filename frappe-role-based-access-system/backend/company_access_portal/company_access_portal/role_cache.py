@@ -0,0 +1,126 @@
+import frappe
+from frappe.utils.data import cint
+
+from company_access_portal.utils import bump_version, bump_version_after_commit, get_version
+
+# ============================================================
+# 🧠 PER-USER ROLE CACHE
+# ============================================================
+# Admin checks run on every whitelisted call, so the role set of a
+# user is kept in a process-local dict (optionally mirrored in Redis
+# when `company_access_role_cache_redis` is set in site_config).
+#
+# Every entry is tagged with the shared "roles" version counter.
+# Any change to User / Has Role / Role bumps the counter, which makes
+# all cached entries stale in every worker at once.
+
+ROLE_VERSION = "roles"
+# bumped only when Role rows themselves change (role list caches)
+ROLE_TABLE_VERSION = "role_table"
+REDIS_HASH = "company_access_portal:user_roles"
+MAX_LOCAL_ENTRIES = 5000
+
+ADMIN_ROLES = ("Company Admin", "System Manager")
+
+_local_roles = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def use_redis():
+    return cint(frappe.conf.get("company_access_role_cache_redis"))
+
+
+def get_roles(user=None):
+    """Return the role set of `user` as a frozenset."""
+    user = user or frappe.session.user
+    version = get_version(ROLE_VERSION)
+    key = (frappe.local.site, user)
+
+    entry = _local_roles.get(key)
+    if entry and entry[0] == version:
+        _stats["hits"] += 1
+        return entry[1]
+
+    roles = None
+
+    if use_redis():
+        cached = frappe.cache().hget(REDIS_HASH, user)
+        if cached and cached[0] == version:
+            roles = frozenset(cached[1])
+
+    if roles is None:
+        _stats["misses"] += 1
+        roles = frozenset(frappe.get_roles(user))
+
+        if use_redis():
+            frappe.cache().hset(REDIS_HASH, user, (version, sorted(roles)))
+    else:
+        _stats["hits"] += 1
+
+    if len(_local_roles) >= MAX_LOCAL_ENTRIES:
+        _local_roles.clear()
+
+    _local_roles[key] = (version, roles)
+    return roles
+
+
+def has_any_role(roles, user=None):
+    return not get_roles(user).isdisjoint(roles)
+
+
+def invalidate(users=None):
+    """Drop cached roles for `users` (or everybody) in every worker.
+
+    The version is bumped immediately and once more after commit, so a
+    worker that reads the old rows before our commit cannot keep them.
+    """
+    _invalidate(users)
+
+    if getattr(frappe.db, "after_commit", None) is not None:
+        frappe.db.after_commit.add(lambda: _invalidate(users))
+
+
+def _invalidate(users=None):
+    _stats["invalidations"] += 1
+
+    if isinstance(users, str):
+        users = [users]
+
+    if users:
+        for user in users:
+            _local_roles.pop((frappe.local.site, user), None)
+            frappe.cache().hdel(REDIS_HASH, user)
+            # keep frappe.get_roles() in step for rows written directly
+            frappe.cache().hdel("roles", user)
+    else:
+        _local_roles.clear()
+        frappe.cache().delete_value(REDIS_HASH)
+
+    bump_version(ROLE_VERSION)
+
+
+def get_stats():
+    return {
+        **_stats,
+        "size": len(_local_roles),
+        "version": get_version(ROLE_VERSION),
+        "backend": "redis" if use_redis() else "local",
+    }
+
+
+# ============================================================
+# 🔔 DOC EVENTS (wired in hooks.py)
+# ============================================================
+
+def on_user_change(doc, method=None):
+    invalidate(doc.name)
+
+
+def on_has_role_change(doc, method=None):
+    if doc.parenttype == "User" and doc.parent:
+        invalidate(doc.parent)
+
+
+def on_role_change(doc, method=None):
+    invalidate()
+    bump_version_after_commit(ROLE_TABLE_VERSION)
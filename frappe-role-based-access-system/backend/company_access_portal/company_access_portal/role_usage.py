@@ -0,0 +1,118 @@
+import frappe
+from frappe.utils import now_datetime
+
+from company_access_portal import role_cache
+from company_access_portal.utils import bump_version_after_commit
+
+# ============================================================
+# 📊 ROLE USAGE COUNTERS
+# ============================================================
+# "Company Role Usage" keeps the number of users holding each role.
+# It is adjusted incrementally from User / Has Role hooks and from the
+# bulk paths that write Has Role rows directly (bulk_create_users,
+# set_user_roles), and rebuilt from one GROUP BY by the daily job.
+
+USAGE_DOCTYPE = "Company Role Usage"
+
+
+def apply_deltas(deltas):
+    """Add ``{role: delta}`` to the counters (rows are created on demand)."""
+    deltas = {role: delta for role, delta in deltas.items() if role and delta}
+    if not deltas:
+        return
+
+    now = now_datetime()
+    user = frappe.session.user
+
+    for role, delta in deltas.items():
+        frappe.db.sql(
+            """
+            insert into `tabCompany Role Usage`
+                (`name`, `role`, `user_count`, `creation`, `modified`, `owner`, `modified_by`)
+            values (%(role)s, %(role)s, greatest(%(delta)s, 0), %(now)s, %(now)s, %(user)s, %(user)s)
+            on duplicate key update
+                `user_count` = greatest(`user_count` + %(delta)s, 0),
+                `modified` = %(now)s
+            """,
+            {"role": role, "delta": delta, "now": now, "user": user}
+        )
+
+
+def count_from_has_role():
+    return dict(frappe.db.sql(
+        """
+        select `role`, count(distinct `parent`)
+        from `tabHas Role`
+        where `parenttype` = 'User'
+        group by `role`
+        """
+    ))
+
+
+def rebuild():
+    """Reset every counter from one GROUP BY over Has Role."""
+    before = {role: count for role, count in get_counts().items() if count}
+    counts = count_from_has_role()
+    now = now_datetime()
+    user = frappe.session.user
+
+    frappe.db.delete(USAGE_DOCTYPE)
+
+    if counts:
+        frappe.db.bulk_insert(
+            USAGE_DOCTYPE,
+            fields=["name", "role", "user_count", "creation", "modified", "owner", "modified_by"],
+            values=[(role, role, count, now, now, user, user) for role, count in counts.items()]
+        )
+
+    # list_roles(with_counts=1) is cached under the role table version
+    if before != counts:
+        bump_version_after_commit(role_cache.ROLE_TABLE_VERSION)
+
+    return counts
+
+
+def get_counts():
+    return dict(frappe.get_all(USAGE_DOCTYPE, fields=["role", "user_count"], as_list=True))
+
+
+def reconcile():
+    """Scheduler job: repair any drift of the incremental counters."""
+    rebuild()
+    frappe.db.commit()
+
+
+# ============================================================
+# 🔔 DOC EVENTS (wired in hooks.py)
+# ============================================================
+
+def _role_set(doc):
+    return {row.role for row in (doc.get("roles") or []) if row.role} if doc else set()
+
+
+def on_user_update(doc, method=None):
+    # also runs right after insert, when there is no doc before save
+    before = _role_set(doc.get_doc_before_save())
+    after = _role_set(doc)
+
+    deltas = dict.fromkeys(after - before, 1)
+    deltas.update(dict.fromkeys(before - after, -1))
+    apply_deltas(deltas)
+
+
+def on_user_trash(doc, method=None):
+    apply_deltas(dict.fromkeys(_role_set(doc), -1))
+
+
+def on_has_role_insert(doc, method=None):
+    if doc.parenttype == "User":
+        apply_deltas({doc.role: 1})
+
+
+def on_has_role_trash(doc, method=None):
+    if doc.parenttype == "User":
+        apply_deltas({doc.role: -1})
+
+
+def on_role_trash(doc, method=None):
+    frappe.db.delete(USAGE_DOCTYPE, {"role": doc.name})
@@ -0,0 +1,110 @@
+import frappe
+from frappe.utils import add_days, now_datetime
+from frappe.utils.data import cint
+
+from company_access_portal import task_realtime, task_sync
+
+# ============================================================
+# 🧊 COMPANY TASK ARCHIVE (HOT / COLD)
+# ============================================================
+# Completed tasks untouched for `company_task_archive_days` (site
+# config, default DEFAULT_ARCHIVE_DAYS, 0 disables) are moved by the
+# daily job from "Company Task" into "Company Task Archive", BATCH_SIZE
+# rows per transaction, so list / search / sync queries run against a
+# small hot table. Rows keep their name, owner and timestamps.
+#
+# Moving a task leaves a tombstone and publishes a realtime "delete"
+# (clients drop it from their local copy) and keeps its search tokens
+# (search_tasks(include_archived=1)). Candidates are selected FOR
+# UPDATE, so a task reopened concurrently is either archived before the
+# edit or skipped, never moved after it.
+# Summary counters keep counting archived tasks: task_summary
+# reconciles across both tables.
+
+TASK_DOCTYPE = "Company Task"
+ARCHIVE_DOCTYPE = "Company Task Archive"
+DEFAULT_ARCHIVE_DAYS = 90
+BATCH_SIZE = 500
+
+ARCHIVE_FIELDS = [
+    "name", "title", "description", "assigned_to", "status",
+    "creation", "modified", "owner", "modified_by"
+]
+
+
+def get_archive_days():
+    value = frappe.conf.get("company_task_archive_days")
+    return DEFAULT_ARCHIVE_DAYS if value is None else cint(value)
+
+
+def get_task_tables(include_archived=False):
+    """Doctypes a task query should read from."""
+    return [TASK_DOCTYPE, ARCHIVE_DOCTYPE] if cint(include_archived) else [TASK_DOCTYPE]
+
+
+def archive_batch(names):
+    """Move `names` from the hot table to the archive in the current transaction.
+
+    The rows must be locked by the caller (see archive_completed_tasks).
+    """
+    columns = ", ".join(f"`{f}`" for f in ARCHIVE_FIELDS)
+
+    frappe.db.sql(
+        f"""
+        insert into `tab{ARCHIVE_DOCTYPE}` ({columns}, `archived_on`)
+        select {columns}, %(now)s
+        from `tab{TASK_DOCTYPE}`
+        where `name` in %(names)s
+        """,
+        {"names": names, "now": now_datetime()}
+    )
+
+    tasks = frappe.db.sql(
+        f"""
+        select `name`, {", ".join(f"`{f}`" for f in task_realtime.PAYLOAD_FIELDS)}
+        from `tab{TASK_DOCTYPE}`
+        where `name` in %(names)s
+        """,
+        {"names": names},
+        as_dict=True
+    )
+
+    task_sync.record_tombstones([(task.name, task.owner, task.assigned_to) for task in tasks])
+
+    # sent after commit, one event per user for the whole batch
+    for task in tasks:
+        task_realtime.on_task_trash(task)
+
+    frappe.db.delete("DocShare", {"share_doctype": TASK_DOCTYPE, "share_name": ["in", names]})
+    frappe.db.delete(TASK_DOCTYPE, {"name": ["in", names]})
+
+
+def archive_completed_tasks(days=None, batch_size=BATCH_SIZE):
+    """Scheduler job: archive Completed tasks not modified for `days` days."""
+    days = get_archive_days() if days is None else cint(days)
+    if days <= 0:
+        return 0
+
+    cutoff = add_days(now_datetime(), -days)
+    archived = 0
+
+    while True:
+        names = frappe.db.sql_list(
+            f"""
+            select `name` from `tab{TASK_DOCTYPE}`
+            where `status` = 'Completed' and `modified` < %s
+            order by `modified`
+            limit %s
+            for update
+            """,
+            (cutoff, batch_size)
+        )
+
+        if not names:
+            break
+
+        archive_batch(names)
+        frappe.db.commit()
+        archived += len(names)
+
+    return archived
@@ -0,0 +1,145 @@
+import frappe
+
+from company_access_portal import permission_evaluator, role_cache
+from company_access_portal.company_access.doctype.company_task.company_task import get_doc_mask
+from company_access_portal.utils import get_version
+
+# ============================================================
+# 📡 COMPANY TASK REALTIME EVENTS
+# ============================================================
+# Company Task hooks queue a compact change record per document in
+# frappe.local; after commit the queue is flushed as ONE
+# "company_task_change" event per recipient (user room), so a request
+# saving the same task five times or touching 200 tasks still sends
+# one message per user. Rolled back changes are never published.
+#
+# Recipients follow the read rule of get_permission_query_conditions:
+# users with full read on Company Task see every change, users with
+# only If Owner read see changes to tasks they own or are assigned to
+# (company_task.get_doc_mask). A user who could see the task before an
+# update but not after receives a "delete".
+
+EVENT = "company_task_change"
+DOCTYPE = "Company Task"
+PENDING_KEY = "company_task_realtime"
+PAYLOAD_FIELDS = ("title", "status", "assigned_to", "owner", "modified")
+
+_full_readers = {}
+
+
+def get_full_readers():
+    """Enabled users whose roles grant read on every Company Task."""
+    version = (
+        get_version(role_cache.ROLE_VERSION),
+        get_version(permission_evaluator.doctype_version_key(DOCTYPE))
+    )
+    key = frappe.local.site
+
+    entry = _full_readers.get(key)
+    if entry and entry[0] == version:
+        return entry[1]
+
+    read = permission_evaluator.PERMISSION_BITS["read"]
+    roles = [
+        role for role, (mask, _owner_mask) in permission_evaluator.get_compiled(DOCTYPE).items()
+        if mask & read
+    ]
+
+    users = {"Administrator"}
+    if roles:
+        users.update(frappe.db.sql_list(
+            """
+            select distinct hr.`parent`
+            from `tabHas Role` hr
+            join `tabUser` u on u.`name` = hr.`parent`
+            where hr.`parenttype` = 'User' and u.`enabled` = 1
+                and hr.`role` in %(roles)s
+            """,
+            {"roles": roles}
+        ))
+
+    users = frozenset(users)
+    _full_readers[key] = (version, users)
+
+    return users
+
+
+def can_see(user, values):
+    return bool(get_doc_mask(values, user) & permission_evaluator.PERMISSION_BITS["read"])
+
+
+# ============================================================
+# 🔔 DOC EVENTS (wired in hooks.py)
+# ============================================================
+
+def _queue(doc, action, previous=None):
+    pending = frappe.local.cache.setdefault(PENDING_KEY, {})
+    deferred = getattr(frappe.db, "after_commit", None) is not None
+
+    if not pending and deferred:
+        frappe.db.after_commit.add(flush)
+        if getattr(frappe.db, "after_rollback", None) is not None:
+            frappe.db.after_rollback.add(discard)
+
+    change = pending.get(doc.name)
+    if change is None:
+        # keep the oldest "previous" values of the burst
+        change = pending[doc.name] = {"previous": previous or {}}
+
+    change["action"] = action
+    change["values"] = {field: doc.get(field) for field in PAYLOAD_FIELDS}
+
+    if not deferred:
+        flush()
+
+
+def on_task_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    previous = {"owner": before.owner, "assigned_to": before.assigned_to} if before else None
+
+    _queue(doc, "update", previous)
+
+
+def on_task_trash(doc, method=None):
+    _queue(doc, "delete")
+
+
+def discard():
+    frappe.local.cache.pop(PENDING_KEY, None)
+
+
+def flush():
+    pending = frappe.local.cache.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    full_readers = get_full_readers()
+    messages = {}
+
+    for name, change in pending.items():
+        values = change["values"]
+        previous = change["previous"]
+
+        candidates = {
+            values["owner"], values["assigned_to"],
+            previous.get("owner"), previous.get("assigned_to")
+        }
+        candidates.discard(None)
+
+        for user in candidates | full_readers:
+            visible = user in full_readers or can_see(user, values)
+            action = change["action"]
+
+            if not visible:
+                if action == "delete" or not previous or not can_see(user, previous):
+                    continue
+                action = "delete"
+
+            record = {"name": name, "action": action}
+            if action == "update":
+                record.update(values)
+
+            messages.setdefault(user, []).append(record)
+
+    for user, changes in messages.items():
+        frappe.publish_realtime(EVENT, {"changes": changes}, user=user, after_commit=False)
@@ -0,0 +1,121 @@
+import re
+
+import frappe
+from frappe.utils import now_datetime, strip_html
+
+# ============================================================
+# 🔎 COMPANY TASK SEARCH INDEX
+# ============================================================
+# Inverted index over Company Task title + description, kept in
+# "Company Task Search Token": one row per (token, task) with a weight
+# (title occurrences count TITLE_WEIGHT, description occurrences 1).
+# Hooks rewrite a task's rows when its text changes, so a search is an
+# index lookup on `token` instead of a LIKE '%q%' scan of every task.
+
+TOKEN_DOCTYPE = "Company Task Search Token"
+TITLE_WEIGHT = 3
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+MAX_QUERY_TOKENS = 8
+REBUILD_BATCH_SIZE = 1000
+
+STOP_WORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "in", "is", "of", "on", "or", "the", "to", "with"}
+
+_token_pattern = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Lowercase word tokens of `text`, stop words and 1-char tokens dropped."""
+    return [
+        token[:MAX_TOKEN_LENGTH]
+        for token in _token_pattern.findall(strip_html(text or "").lower())
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOP_WORDS
+    ]
+
+
+def task_weights(title, description):
+    weights = {}
+
+    for token in tokenize(title):
+        weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+
+    for token in tokenize(description):
+        weights[token] = weights.get(token, 0) + 1
+
+    return weights
+
+
+def token_rows(task, title, description, now=None, user=None):
+    now = now or now_datetime()
+    user = user or frappe.session.user
+
+    return [
+        (frappe.generate_hash(), token, task, weight, now, now, user, user)
+        for token, weight in task_weights(title, description).items()
+    ]
+
+
+TOKEN_FIELDS = ["name", "token", "task", "weight", "creation", "modified", "owner", "modified_by"]
+
+
+def index_tasks(tasks):
+    """(Re)index ``[(name, title, description), ...]`` with one DELETE and one INSERT."""
+    if not tasks:
+        return
+
+    frappe.db.delete(TOKEN_DOCTYPE, {"task": ["in", [task[0] for task in tasks]]})
+
+    now = now_datetime()
+    user = frappe.session.user
+    values = [row for task in tasks for row in token_rows(*task, now=now, user=user)]
+
+    if values:
+        frappe.db.bulk_insert(TOKEN_DOCTYPE, fields=TOKEN_FIELDS, values=values)
+
+
+def rebuild():
+    """Re-index every Company Task (archived ones included), REBUILD_BATCH_SIZE tasks per commit."""
+    frappe.db.delete(TOKEN_DOCTYPE)
+
+    for doctype in ("Company Task", "Company Task Archive"):
+        after = ""
+        while True:
+            tasks = frappe.db.sql(
+                f"""
+                select `name`, `title`, `description`
+                from `tab{doctype}`
+                where `name` > %s
+                order by `name`
+                limit %s
+                """,
+                (after, REBUILD_BATCH_SIZE)
+            )
+
+            if not tasks:
+                break
+
+            index_tasks(tasks)
+            frappe.db.commit()
+            after = tasks[-1][0]
+
+
+# ============================================================
+# 🔔 DOC EVENTS (wired in hooks.py)
+# ============================================================
+
+def on_task_update(doc, method=None):
+    # also runs right after insert, when there is no doc before save
+    before = doc.get_doc_before_save()
+    if before and (before.title, before.description) == (doc.title, doc.description):
+        return
+
+    index_tasks([(doc.name, doc.title, doc.description)])
+
+
+def on_task_trash(doc, method=None):
+    frappe.db.delete(TOKEN_DOCTYPE, {"task": doc.name})
+
+
+def on_task_rename(doc, method=None, old=None, new=None, merge=False):
+    frappe.db.delete(TOKEN_DOCTYPE, {"task": old})
+    index_tasks([(new, doc.title, doc.description)])
@@ -0,0 +1,190 @@
+import hashlib
+
+import frappe
+from frappe.utils import getdate, now_datetime
+
+# ============================================================
+# 📈 COMPANY TASK SUMMARY COUNTERS
+# ============================================================
+# "Company Task Summary" holds two kinds of counter rows:
+#   • day empty      → tasks per (assigned_to, status)
+#   • day set        → tasks created that day, per status
+# Company Task hooks apply +1 / -1 deltas, so a dashboard reads
+# O(groups) rows instead of scanning tabCompany Task. The daily job
+# rebuilds everything from two GROUP BYs to repair any drift.
+#
+# Row names are derived from the key, which lets apply_deltas() upsert
+# with one statement per key.
+
+SUMMARY_DOCTYPE = "Company Task Summary"
+
+
+def _row_name(assigned_to, status, day):
+    key = f"{assigned_to or ''}|{status}|{day or ''}"
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def task_keys(assigned_to, status, creation):
+    """Counter keys ``(assigned_to, status, day)`` a task contributes to."""
+    status = status or "Open"
+    return [
+        (assigned_to or None, status, None),
+        (None, status, getdate(creation))
+    ]
+
+
+def apply_deltas(deltas):
+    """Add ``{(assigned_to, status, day): delta}`` to the counters."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    now = now_datetime()
+    user = frappe.session.user
+
+    for (assigned_to, status, day), delta in deltas.items():
+        frappe.db.sql(
+            """
+            insert into `tabCompany Task Summary`
+                (`name`, `assigned_to`, `status`, `day`, `task_count`,
+                 `creation`, `modified`, `owner`, `modified_by`)
+            values (%(name)s, %(assigned_to)s, %(status)s, %(day)s, greatest(%(delta)s, 0),
+                %(now)s, %(now)s, %(user)s, %(user)s)
+            on duplicate key update
+                `task_count` = greatest(`task_count` + %(delta)s, 0),
+                `modified` = %(now)s
+            """,
+            {
+                "name": _row_name(assigned_to, status, day),
+                "assigned_to": assigned_to,
+                "status": status,
+                "day": day,
+                "delta": delta,
+                "now": now,
+                "user": user
+            }
+        )
+
+
+# archived tasks still count, so the rebuild reads the archive too
+COUNTED_TABLES = """(
+    select `assigned_to`, `status`, `creation` from `tabCompany Task`
+    union all
+    select `assigned_to`, `status`, `creation` from `tabCompany Task Archive`
+) t"""
+
+
+def count_from_tasks():
+    counts = {}
+
+    for assigned_to, status, count in frappe.db.sql(
+        f"""
+        select `assigned_to`, ifnull(`status`, 'Open'), count(*)
+        from {COUNTED_TABLES}
+        group by `assigned_to`, ifnull(`status`, 'Open')
+        """
+    ):
+        counts[(assigned_to or None, status, None)] = count
+
+    for day, status, count in frappe.db.sql(
+        f"""
+        select date(`creation`), ifnull(`status`, 'Open'), count(*)
+        from {COUNTED_TABLES}
+        group by date(`creation`), ifnull(`status`, 'Open')
+        """
+    ):
+        counts[(None, status, day)] = count
+
+    return counts
+
+
+def rebuild():
+    """Reset every counter from the Company Task and archive tables."""
+    counts = count_from_tasks()
+    now = now_datetime()
+    user = frappe.session.user
+
+    frappe.db.delete(SUMMARY_DOCTYPE)
+
+    if counts:
+        frappe.db.bulk_insert(
+            SUMMARY_DOCTYPE,
+            fields=[
+                "name", "assigned_to", "status", "day", "task_count",
+                "creation", "modified", "owner", "modified_by"
+            ],
+            values=[
+                (_row_name(*key), *key, count, now, now, user, user)
+                for key, count in counts.items()
+            ]
+        )
+
+    return counts
+
+
+def get_summary(from_date=None, to_date=None):
+    """Counters as ``{"by_assignee": [...], "by_day": [...]}``."""
+    by_assignee = frappe.get_all(
+        SUMMARY_DOCTYPE,
+        filters={"day": ["is", "not set"], "task_count": [">", 0]},
+        fields=["assigned_to", "status", "task_count"],
+        order_by="assigned_to asc, status asc"
+    )
+
+    day_filters = {"day": ["is", "set"], "task_count": [">", 0]}
+    if from_date and to_date:
+        day_filters["day"] = ["between", [getdate(from_date), getdate(to_date)]]
+    elif from_date:
+        day_filters["day"] = [">=", getdate(from_date)]
+    elif to_date:
+        day_filters["day"] = ["<=", getdate(to_date)]
+
+    by_day = frappe.get_all(
+        SUMMARY_DOCTYPE,
+        filters=day_filters,
+        fields=["day", "status", "task_count"],
+        order_by="day asc, status asc"
+    )
+
+    return {"by_assignee": by_assignee, "by_day": by_day}
+
+
+def reconcile():
+    """Scheduler job: repair any drift of the incremental counters."""
+    rebuild()
+    frappe.db.commit()
+
+
+# ============================================================
+# 🔔 DOC EVENTS (wired in hooks.py)
+# ============================================================
+
+def _add(deltas, doc, delta):
+    for key in task_keys(doc.assigned_to, doc.status, doc.creation):
+        deltas[key] = deltas.get(key, 0) + delta
+
+
+def on_task_insert(doc, method=None):
+    deltas = {}
+    _add(deltas, doc, 1)
+    apply_deltas(deltas)
+
+
+def on_task_update(doc, method=None):
+    before = doc.get_doc_before_save()
+    if not before:
+        return
+
+    if (before.assigned_to, before.status) == (doc.assigned_to, doc.status):
+        return
+
+    deltas = {}
+    _add(deltas, before, -1)
+    _add(deltas, doc, 1)
+    apply_deltas(deltas)
+
+
+def on_task_trash(doc, method=None):
+    deltas = {}
+    _add(deltas, doc, -1)
+    apply_deltas(deltas)
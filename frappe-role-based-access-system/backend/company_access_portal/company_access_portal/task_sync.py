@@ -0,0 +1,97 @@
+import frappe
+from frappe.utils import add_days, now_datetime
+
+from company_access_portal import permission_evaluator
+
+# ============================================================
+# 🪦 COMPANY TASK TOMBSTONES
+# ============================================================
+# Deleting, renaming or archiving a Company Task leaves a "Company Task
+# Tombstone" row behind so get_task_changes() can tell polling
+# clients which rows to drop. Tombstones are kept RETENTION_DAYS;
+# a client whose cursor is older than that is told to resync.
+
+TOMBSTONE_DOCTYPE = "Company Task Tombstone"
+RETENTION_DAYS = 30
+PURGE_BATCH_SIZE = 1000
+
+# cursors older than this were issued before tombstones were purged
+PURGED_BEFORE_KEY = "company_access_portal:task_tombstones_purged_before"
+
+
+def record_tombstones(tasks):
+    """Tombstones for ``[(name, owner, assigned_to), ...]`` in one INSERT."""
+    if not tasks:
+        return
+
+    now = now_datetime()
+    user = frappe.session.user
+
+    frappe.db.bulk_insert(
+        TOMBSTONE_DOCTYPE,
+        fields=[
+            "name", "task", "task_owner", "assigned_to", "deleted_on",
+            "creation", "modified", "owner", "modified_by"
+        ],
+        values=[
+            (frappe.generate_hash(), name, owner, assigned_to, now, now, now, user, user)
+            for name, owner, assigned_to in tasks
+        ]
+    )
+
+
+def record_tombstone(name, owner, assigned_to=None):
+    record_tombstones([(name, owner, assigned_to)])
+
+
+def on_task_trash(doc, method=None):
+    record_tombstone(doc.name, doc.owner, doc.assigned_to)
+
+
+def on_task_rename(doc, method=None, old=None, new=None, merge=False):
+    # clients only know the old name; the row itself is re-sent under
+    # the new one because renaming touches `modified`
+    record_tombstone(old, doc.owner, doc.assigned_to)
+
+
+def get_tombstone_conditions(user):
+    """Mirror of Company Task's permission query, on the tombstone columns."""
+    mask, owner_mask = permission_evaluator.get_masks("Company Task", user)
+    read = permission_evaluator.PERMISSION_BITS["read"]
+
+    if mask & read:
+        return ""
+
+    if owner_mask & read:
+        user = frappe.db.escape(user)
+        return f"(`task_owner` = {user} or `assigned_to` = {user})"
+
+    return "1=0"
+
+
+def get_retention_horizon():
+    return add_days(now_datetime(), -RETENTION_DAYS)
+
+
+def get_purged_before():
+    return frappe.cache().get_value(PURGED_BEFORE_KEY)
+
+
+def purge_tombstones():
+    """Scheduler job: drop tombstones past the retention window."""
+    horizon = get_retention_horizon()
+    frappe.cache().set_value(PURGED_BEFORE_KEY, str(horizon))
+
+    while True:
+        names = frappe.get_all(
+            TOMBSTONE_DOCTYPE,
+            filters={"deleted_on": ["<", horizon]},
+            limit=PURGE_BATCH_SIZE,
+            pluck="name"
+        )
+
+        if not names:
+            break
+
+        frappe.db.delete(TOMBSTONE_DOCTYPE, {"name": ["in", names]})
+        frappe.db.commit()
@@ -0,0 +1,104 @@
+# Copyright (c) 2026, udayp and Contributors
+# See license.txt
+
+import itertools
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import frappe
+from frappe import _
+from frappe.tests.utils import FrappeTestCase
+from werkzeug.datastructures import FileStorage
+
+from company_access_portal import bulk_users
+
+
+def file_storage(content, filename):
+	# werkzeug spools larger multipart uploads to a SpooledTemporaryFile
+	stream = tempfile.SpooledTemporaryFile(max_size=1024, mode="w+b")
+	stream.write(content.encode("utf-8"))
+	stream.seek(0)
+	return FileStorage(stream=stream, filename=filename)
+
+
+class TestBulkUsers(FrappeTestCase):
+	def setUp(self):
+		self.request = getattr(frappe.local, "request", None)
+		self.emails = []
+
+	def tearDown(self):
+		frappe.local.request = self.request
+
+		for email in self.emails:
+			frappe.db.delete("Has Role", {"parent": email})
+			frappe.db.delete("User", {"name": email})
+		frappe.db.commit()
+
+	def new_email(self):
+		email = f"bulk-{frappe.generate_hash(length=10)}@example.com"
+		self.emails.append(email)
+		return email
+
+	def upload(self, content, filename):
+		frappe.local.request = SimpleNamespace(files={"file": file_storage(content, filename)})
+		return bulk_users.open_upload()
+
+	def test_csv_upload(self):
+		stream, file_format = self.upload(
+			"\ufeffemail,first_name,roles\r\na@example.com,\"Ann\nMarie\",Employee\r\n", "users.csv"
+		)
+
+		self.assertEqual(file_format, "csv")
+		self.assertEqual(
+			list(bulk_users.iter_rows(stream, file_format)),
+			[{"email": "a@example.com", "first_name": "Ann\nMarie", "roles": "Employee"}],
+		)
+
+	def test_jsonl_upload(self):
+		stream, file_format = self.upload('{"email": "a@example.com"}\n\nnot json\n', "users.jsonl")
+		rows = list(bulk_users.iter_rows(stream, file_format))
+
+		self.assertEqual(file_format, "jsonl")
+		self.assertEqual(rows[0], {"email": "a@example.com"})
+		self.assertIsInstance(rows[1], bulk_users.InvalidRow)
+
+	def test_max_rows_truncates_once(self):
+		# an endless upload: import_users must stop reading after MAX_ROWS
+		rows = ({"email": f"not-an-email-{i}"} for i in itertools.count())
+
+		with patch.object(bulk_users, "MAX_ROWS", 3):
+			results = bulk_users.import_users(rows, send_invitations=False)
+
+		self.assertEqual(len(results), 4)
+		self.assertEqual([r["message"] for r in results[:3]], [_("Invalid email address")] * 3)
+		self.assertEqual(results[3]["row"], 4)
+		self.assertIn("truncated", results[3]["message"])
+
+	def test_validation_and_duplicates(self):
+		first, second = self.new_email(), self.new_email()
+
+		results = bulk_users.import_users(
+			[
+				{"email": "not-an-email"},
+				# fails, so it must not turn the next row into a duplicate
+				{"email": first, "roles": "No Such Role"},
+				{"email": first.upper(), "first_name": "First"},
+				{"email": first},
+				{"email": second, "roles": ["No Such Role"]},
+				["not", "an", "object"],
+				{"email": second, "first_name": 5},
+			],
+			send_invitations=False,
+		)
+
+		self.assertEqual(
+			[(r["row"], r["status"]) for r in results],
+			[(1, "error"), (2, "error"), (4, "error"), (5, "error"), (6, "error"), (7, "error"), (3, "created")],
+		)
+		self.assertEqual(results[2]["message"], _("Duplicate email in upload"))
+		self.assertEqual(frappe.db.get_value("User", first, "first_name"), "First")
+		self.assertFalse(frappe.db.exists("User", second))
+
+		again = bulk_users.import_users([{"email": first}], send_invitations=False)
+		self.assertEqual(again[0]["status"], "skipped")
@@ -0,0 +1,107 @@
+# Copyright (c) 2026, udayp and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from company_access_portal import role_cache, role_usage
+from company_access_portal.api import user_api
+
+TEST_ROLES = ("Set Roles Test A", "Set Roles Test B")
+
+
+class TestListUserFields(FrappeTestCase):
+	def test_comma_separated(self):
+		self.assertEqual(user_api._parse_fields("first_name"), ["first_name"])
+		self.assertEqual(
+			user_api._parse_fields(" first_name, last_name ,"), ["first_name", "last_name"]
+		)
+
+	def test_json_list(self):
+		self.assertEqual(
+			user_api._parse_fields('["first_name", "enabled"]'), ["first_name", "enabled"]
+		)
+		self.assertEqual(user_api._parse_fields(["first_name"]), ["first_name"])
+
+	def test_bad_input(self):
+		for fields in ('["first_name"', "[1, 2]", ["first_name", 1]):
+			with self.assertRaises(frappe.ValidationError):
+				user_api._parse_fields(fields)
+
+	def test_list_users_bare_field_name(self):
+		with patch.object(user_api, "throw_if_not_admin"):
+			page = user_api.list_users(fields="first_name", limit=5, with_total=0)
+
+		for user in page["users"]:
+			self.assertIn("first_name", user)
+
+
+class TestSetUserRoles(FrappeTestCase):
+	def setUp(self):
+		for role in TEST_ROLES:
+			if not frappe.db.exists("Role", role):
+				frappe.get_doc({"doctype": "Role", "role_name": role, "desk_access": 0}).insert()
+
+		self.users = []
+		for index in range(2):
+			email = f"set-roles-{frappe.generate_hash(length=10)}@example.com"
+			frappe.get_doc({
+				"doctype": "User",
+				"email": email,
+				"first_name": f"Roles {index}",
+				"send_welcome_email": 0,
+				"roles": [{"role": TEST_ROLES[0]}] if index == 0 else [],
+			}).insert()
+			self.users.append(email)
+		frappe.db.commit()
+
+	def tearDown(self):
+		for email in self.users:
+			frappe.db.delete("Has Role", {"parent": email})
+			frappe.db.delete("User", {"name": email})
+		frappe.db.delete(role_usage.USAGE_DOCTYPE, {"role": ["in", TEST_ROLES]})
+		frappe.db.commit()
+
+	def held(self):
+		return {
+			(row.parent, row.role)
+			for row in frappe.get_all(
+				"Has Role",
+				filters={"parent": ["in", self.users], "role": ["in", TEST_ROLES]},
+				fields=["parent", "role"],
+			)
+		}
+
+	def set_roles(self, **kwargs):
+		with patch.object(user_api, "throw_if_not_admin"):
+			return user_api.set_user_roles(users=self.users, **kwargs)
+
+	def test_only_missing_rows_are_inserted(self):
+		role_a, role_b = TEST_ROLES
+		first, second = self.users
+		counts = role_usage.get_counts()
+
+		result = self.set_roles(add=list(TEST_ROLES))
+
+		self.assertEqual((result["added"], result["removed"]), (3, 0))
+		self.assertEqual(
+			self.held(), {(first, role_a), (first, role_b), (second, role_a), (second, role_b)}
+		)
+		self.assertEqual(role_usage.get_counts().get(role_a, 0), counts.get(role_a, 0) + 1)
+		self.assertEqual(role_usage.get_counts().get(role_b, 0), counts.get(role_b, 0) + 2)
+		self.assertIn(role_b, role_cache.get_roles(first))
+
+		result = self.set_roles(add=list(TEST_ROLES))
+		self.assertEqual((result["added"], result["removed"]), (0, 0))
+
+	def test_only_held_rows_are_deleted(self):
+		role_a, role_b = TEST_ROLES
+		first, second = self.users
+
+		result = self.set_roles(add=[role_b], remove=[role_a])
+
+		self.assertEqual((result["added"], result["removed"]), (2, 1))
+		self.assertEqual(self.held(), {(first, role_b), (second, role_b)})
+		self.assertNotIn(role_a, role_cache.get_roles(first))
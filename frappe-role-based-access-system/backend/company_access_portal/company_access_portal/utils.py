@@ -0,0 +1,98 @@
+import base64
+import json
+
+import frappe
+from frappe import _
+from frappe.utils.data import cint
+
+# ============================================================
+# 🔢 CACHE VERSION COUNTERS
+# ============================================================
+# Monotonic counters kept in Redis (shared by every worker of the
+# site). Caches tag their entries with the counter they were built
+# against; bumping the counter invalidates them everywhere at once.
+
+VERSION_KEY_PREFIX = "company_access_portal:version:"
+
+
+def _version_key(name):
+    return frappe.cache().make_key(VERSION_KEY_PREFIX + name)
+
+
+def get_version(name):
+    """Return the current value of counter `name` (memoised per request)."""
+    versions = frappe.local.cache.setdefault("company_access_versions", {})
+
+    if name not in versions:
+        value = frappe.cache().get(_version_key(name))
+        versions[name] = int(value) if value else 0
+
+    return versions[name]
+
+
+def bump_version(name):
+    """Increment counter `name` and return the new value."""
+    value = int(frappe.cache().incr(_version_key(name)))
+
+    versions = frappe.local.cache.setdefault("company_access_versions", {})
+    versions[name] = value
+
+    return value
+
+
+def bump_version_after_commit(name):
+    """Bump now and again after commit, so no worker can cache rows
+    read between the bump and the commit under the new version."""
+    bump_version(name)
+
+    if getattr(frappe.db, "after_commit", None) is not None:
+        frappe.db.after_commit.add(lambda: bump_version(name))
+
+
+# ============================================================
+# 💾 TRANSACTIONS
+# ============================================================
+# API methods commit explicitly. Inside an atomic batch_call the batch
+# owns the transaction, so those commits are left to the batch.
+
+def commit():
+    if not frappe.flags.company_access_atomic_batch:
+        frappe.db.commit()
+
+
+# ============================================================
+# 📄 KEYSET CURSORS
+# ============================================================
+# Opaque cursors for (sort value, name) keyset pagination. They are
+# plain base64 JSON: the values are re-checked by the query anyway.
+
+def encode_cursor(*values):
+    payload = frappe.as_json([str(v) for v in values], indent=None)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size=2):
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        frappe.throw(_("Invalid cursor"))
+
+    if not isinstance(values, list) or len(values) != size:
+        frappe.throw(_("Invalid cursor"))
+
+    return values
+
+
+def get_page_length(limit, default=50, maximum=500):
+    limit = cint(limit) or default
+    return max(1, min(limit, maximum))
+
+
+def like_prefix(text):
+    """LIKE pattern matching values that start with `text`."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
@@ -0,0 +1,22 @@
+import frappe from "./frappe";
+
+// ========================================
+// BATCH RPC
+// ========================================
+// Runs several company_access_portal.api.* calls in one request.
+// Resolves to one { ok, result | error } per call, in order.
+// With { atomic: true } every call shares one all-or-nothing transaction.
+
+export const batchCall = async (calls, { atomic = false } = {}) => {
+  const res = await frappe.post(
+    "/api/method/company_access_portal.api.batch_api.batch_call",
+    { calls, atomic: atomic ? 1 : 0 }
+  );
+
+  return res.data?.message || [];
+};
+
+export const api = (method, args = {}) => ({
+  method: `company_access_portal.api.${method}`,
+  args,
+});
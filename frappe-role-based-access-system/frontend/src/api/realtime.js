@@ -0,0 +1,49 @@
+// ========================================
+// FRAPPE REALTIME (SOCKET.IO)
+// ========================================
+// The socket.io client is served by Frappe's realtime server itself,
+// so no extra npm dependency is needed. Connection details come from
+// the session bootstrap payload ({ site, port }).
+
+let loader = null;
+let socket = null;
+
+const loadClient = (baseUrl) => {
+  if (window.io) return Promise.resolve(window.io);
+
+  if (!loader) {
+    loader = new Promise((resolve, reject) => {
+      const script = document.createElement("script");
+      script.src = `${baseUrl}/socket.io/socket.io.js`;
+      script.onload = () => resolve(window.io);
+      script.onerror = () => {
+        loader = null;
+        reject(new Error("Realtime server not reachable"));
+      };
+      document.head.appendChild(script);
+    });
+  }
+
+  return loader;
+};
+
+export const connectRealtime = async (config) => {
+  if (socket) return socket;
+
+  const baseUrl = `${window.location.protocol}//${window.location.hostname}:${config.port}`;
+  const io = await loadClient(baseUrl);
+
+  socket = io(`${baseUrl}/${config.site}`, {
+    withCredentials: true,
+    reconnectionAttempts: 10,
+  });
+
+  return socket;
+};
+
+export const disconnectRealtime = () => {
+  if (socket) {
+    socket.disconnect();
+    socket = null;
+  }
+};
@@ -5,28 +5,47 @@ import React, {
   useCallback,
 } from "react";
 import frappe from "../api/frappe";
+import { disconnectRealtime } from "../api/realtime";
 
 export const AuthContext = createContext();
 
 export function AuthProvider({ children }) {
   const [user, setUser] = useState(null);
+  const [bootstrap, setBootstrap] = useState(null);
   const [loading, setLoading] = useState(true);
 
   // =========================================
-  // 🔐 CHECK SESSION (ONLY IF REACT LOGIN)
+  // 🔐 CHECK SESSION (ONE BOOTSTRAP CALL)
   // =========================================
   const checkSession = useCallback(async () => {
     try {
+      let cached = null;
+      try {
+        cached = JSON.parse(sessionStorage.getItem("bootstrap") || "null");
+      } catch {}
+
       const res = await frappe.get(
-        "/api/method/company_access_portal.api.user_api.get_current_user_info"
+        "/api/method/company_access_portal.api.session_api.bootstrap",
+        {
+          params: { etag: cached?.version },
+          validateStatus: (status) => status === 200 || status === 304,
+        }
       );
 
-      if (res?.data?.message?.email) {
-        setUser(res.data.message);
+      const data = res.status === 304 ? cached : res?.data?.message;
+
+      if (data?.user?.email) {
+        if (res.status !== 304) {
+          sessionStorage.setItem("bootstrap", JSON.stringify(data));
+        }
+        setBootstrap(data);
+        setUser(data.user);
       } else {
+        setBootstrap(null);
         setUser(null);
       }
     } catch {
+      setBootstrap(null);
       setUser(null);
     } finally {
       setLoading(false);
@@ -71,6 +90,7 @@ export function AuthProvider({ children }) {
     } finally {
       // 🔥 Remove React session marker
       localStorage.removeItem("react_auth");
+      disconnectRealtime();
 
       // 🔥 Clear everything
       window.localStorage.clear();
@@ -109,6 +129,8 @@ export function AuthProvider({ children }) {
     <AuthContext.Provider
       value={{
         user,
+        bootstrap,
+        refreshSession: checkSession,
         loading,
         isAdmin,
         login,
@@ -1,9 +1,14 @@
-import React, { useEffect, useState } from "react";
+import React, { useContext, useEffect, useState } from "react";
 import frappe from "../api/frappe";
+import { api, batchCall } from "../api/batch";
 import { useNavigate, useLocation } from "react-router-dom";
+import { AuthContext } from "../context/AuthContext";
 
 export default function Admin() {
   const [users, setUsers] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalUsers, setTotalUsers] = useState(null);
+  const [search, setSearch] = useState("");
   const [roles, setRoles] = useState([]);
   const [selectedRoles, setSelectedRoles] = useState([]);
   const [email, setEmail] = useState("");
@@ -15,58 +20,54 @@ export default function Admin() {
 
   const navigate = useNavigate();
   const location = useLocation();
+  const { bootstrap } = useContext(AuthContext);
 
   // =========================================
   // LOAD USERS
   // =========================================
-  const loadUsers = async () => {
-    try {
-      const res = await frappe.get(
-        "/api/method/company_access_portal.api.user_api.list_users"
-      );
+  const applyUsers = (page = {}, cursor = null) => {
+    const userData = Array.isArray(page.users) ? page.users : [];
 
-      const userData = res?.data?.message;
-      setUsers(Array.isArray(userData) ? userData : []);
-    } catch (err) {
-      console.error("User load failed:", err);
-      navigate("/tasks");
-    }
+    setUsers((prev) => (cursor ? [...prev, ...userData] : userData));
+    setNextCursor(page.next_cursor || null);
+    if (!cursor) setTotalUsers(page.total ?? null);
   };
 
-  // =========================================
-  // LOAD ROLES (BULLETPROOF)
-  // =========================================
-  const loadRoles = async () => {
+  const listUsersCall = (cursor = null, query = search) =>
+    api("user_api.list_users", {
+      cursor,
+      search: query || undefined,
+      limit: 50,
+    });
+
+  const loadUsers = async (cursor = null, query = search) => {
     try {
       const res = await frappe.get(
-        "/api/method/company_access_portal.api.role_api.list_roles"
+        "/api/method/company_access_portal.api.user_api.list_users",
+        { params: { cursor, search: query || undefined, limit: 50 } }
       );
 
-      const roleData = res?.data?.message;
-
-      if (Array.isArray(roleData)) {
-        setRoles(roleData);
-      } else {
-        setRoles([]);
-      }
+      applyUsers(res?.data?.message || {}, cursor);
     } catch (err) {
-      console.error("Failed loading roles:", err);
-      setRoles([]);
-      setError("Failed to load roles.");
+      console.error("User load failed:", err);
+      navigate("/tasks");
     }
   };
 
+  // Roles come with the session bootstrap (refreshed by the /roles page)
+  useEffect(() => {
+    setRoles(Array.isArray(bootstrap?.roles) ? bootstrap.roles : []);
+  }, [bootstrap]);
+
   // Reload when returning from /roles page
   useEffect(() => {
     setLoading(true);
 
-    Promise.all([loadUsers(), loadRoles()]).finally(() =>
-      setLoading(false)
-    );
+    loadUsers().finally(() => setLoading(false));
   }, [location]);
 
   // =========================================
-  // CREATE USER
+  // CREATE USER (+ REFRESHED LIST, ONE REQUEST)
   // =========================================
   const createUser = async (e) => {
     e.preventDefault();
@@ -85,15 +86,20 @@ export default function Admin() {
       setSubmitting(true);
       setError("");
 
-      await frappe.post(
-        "/api/method/company_access_portal.api.user_api.create_user",
-        {
+      const [created, usersRes] = await batchCall([
+        api("user_api.create_user", {
           email: email.trim(),
           first_name: firstName.trim(),
           last_name: lastName.trim(),
           roles: selectedRoles,
-        }
-      );
+        }),
+        listUsersCall(),
+      ]);
+
+      if (!created.ok) {
+        setError(created.error || "Error creating user.");
+        return;
+      }
 
       // Reset form
       setEmail("");
@@ -101,7 +107,7 @@ export default function Admin() {
       setLastName("");
       setSelectedRoles([]);
 
-      await loadUsers(); // refresh list
+      if (usersRes?.ok) applyUsers(usersRes.result);
     } catch (err) {
       setError(err?.message || "Error creating user.");
     } finally {
@@ -209,7 +215,26 @@ export default function Admin() {
 
       {/* ================= USER LIST ================= */}
       <div className="card" style={{ marginTop: 30 }}>
-        <h2>All Users</h2>
+        <h2>
+          All Users
+          {totalUsers !== null && ` (${totalUsers})`}
+        </h2>
+
+        <input
+          placeholder="Search by email or name"
+          value={search}
+          onChange={(e) => {
+            setSearch(e.target.value);
+            loadUsers(null, e.target.value);
+          }}
+        />
+
+        <a
+          style={{ marginLeft: 10 }}
+          href={`${frappe.defaults.baseURL}/api/method/company_access_portal.api.user_api.export_users?format=csv&search=${encodeURIComponent(search)}`}
+        >
+          Export CSV
+        </a>
 
         {users.length === 0 ? (
           <p>No users found.</p>
@@ -233,6 +258,10 @@ export default function Admin() {
             </tbody>
           </table>
         )}
+
+        {nextCursor && (
+          <button onClick={() => loadUsers(nextCursor)}>Load more</button>
+        )}
       </div>
     </div>
   );
@@ -1,12 +1,14 @@
-import React, { useEffect, useState } from "react";
-import frappe from "../api/frappe";
+import React, { useContext, useEffect, useState } from "react";
+import { api, batchCall } from "../api/batch";
 import { useNavigate } from "react-router-dom";
+import { AuthContext } from "../context/AuthContext";
 
 export default function Roles() {
   const [roles, setRoles] = useState([]);
   const [modules, setModules] = useState({});
   const [selectedRole, setSelectedRole] = useState("");
-  const [permissions, setPermissions] = useState({});
+  const [matrix, setMatrix] = useState({});
+  const [pending, setPending] = useState({});
   const [newRole, setNewRole] = useState("");
   const [error, setError] = useState("");
   const [success, setSuccess] = useState("");
@@ -14,73 +16,41 @@ export default function Roles() {
   const [updating, setUpdating] = useState(false);
 
   const navigate = useNavigate();
+  const { bootstrap, refreshSession } = useContext(AuthContext);
 
   // ===============================
-  // LOAD ROLES
+  // INITIAL LOAD (ROLES / MODULES FROM BOOTSTRAP)
   // ===============================
-  const loadRoles = async () => {
-    try {
-      const res = await frappe.get(
-        "/api/method/company_access_portal.api.role_api.list_roles"
-      );
-      setRoles(res.data?.message || []);
-    } catch (err) {
-      setError("Failed to load roles.");
+  const applyLoaded = ([rolesRes, modulesRes, matrixRes]) => {
+    if (rolesRes?.ok) setRoles(rolesRes.result || []);
+    if (modulesRes?.ok) setModules(modulesRes.result || {});
+    if (matrixRes?.ok) {
+      setMatrix(matrixRes.result?.matrix || {});
+      setPending({});
     }
-  };
 
-  // ===============================
-  // LOAD MODULES
-  // ===============================
-  const loadModules = async () => {
-    try {
-      const res = await frappe.get(
-        "/api/method/company_access_portal.api.role_api.list_modules_with_doctypes"
-      );
-      setModules(res.data?.message || {});
-    } catch {
-      setError("Failed to load modules.");
+    if (![rolesRes, modulesRes, matrixRes].every((r) => r?.ok)) {
+      setError("Failed to load roles and permissions.");
     }
   };
 
-  // ===============================
-  // LOAD PERMISSIONS
-  // ===============================
-  const loadPermissions = async (role) => {
-    if (!role) return;
-
-    try {
-      const res = await frappe.get(
-        `/api/method/company_access_portal.api.role_api.get_role_permissions?role=${role}`
-      );
-
-      const perms = {};
-      (res.data?.message || []).forEach((p) => {
-        perms[p.parent] = {
-          read: !!p.read,
-          write: !!p.write,
-          create: !!p.create,
-          delete: !!p.delete,
-          submit: !!p.submit,
-        };
-      });
+  useEffect(() => {
+    if (!bootstrap) return;
 
-      setPermissions(perms);
-    } catch {
-      setError("Failed to load permissions.");
-    }
-  };
+    setRoles(bootstrap.roles || []);
+    setModules(bootstrap.modules || {});
+  }, [bootstrap]);
 
   useEffect(() => {
-    Promise.all([loadRoles(), loadModules()]).finally(() =>
-      setLoading(false)
-    );
+    batchCall([api("role_api.get_permission_matrix")])
+      .then(([matrixRes]) => {
+        if (!matrixRes?.ok) throw new Error();
+        setMatrix(matrixRes.result?.matrix || {});
+      })
+      .catch(() => setError("Failed to load roles and permissions."))
+      .finally(() => setLoading(false));
   }, []);
 
-  useEffect(() => {
-    loadPermissions(selectedRole);
-  }, [selectedRole]);
-
   // ===============================
   // CREATE ROLE
   // ===============================
@@ -96,16 +66,23 @@ export default function Roles() {
       setError("");
       setSuccess("");
 
-      await frappe.post(
-        "/api/method/company_access_portal.api.role_api.create_role",
-        { role_name: newRole.trim() }
-      );
+      const [created, rolesRes, matrixRes] = await batchCall([
+        api("role_api.create_role", { role_name: newRole.trim() }),
+        api("role_api.list_roles"),
+        api("role_api.get_permission_matrix"),
+      ]);
+
+      if (!created.ok) {
+        setError(created.error || "Failed to create role.");
+        return;
+      }
 
       setSuccess("Role created successfully.");
       setNewRole("");
-      await loadRoles();
+      applyLoaded([rolesRes, { ok: true, result: modules }, matrixRes]);
+      refreshSession();
     } catch (err) {
-      setError(err.response?.data?.message || "Failed to create role.");
+      setError(err.message || "Failed to create role.");
     }
   };
 
@@ -122,51 +99,97 @@ export default function Roles() {
       setError("");
       setSuccess("");
 
-      await frappe.post(
-        "/api/method/company_access_portal.api.role_api.delete_role",
-        { role_name: selectedRole }
-      );
+      const [deleted, rolesRes, matrixRes] = await batchCall([
+        api("role_api.delete_role", { role_name: selectedRole }),
+        api("role_api.list_roles"),
+        api("role_api.get_permission_matrix"),
+      ]);
+
+      if (!deleted.ok) {
+        setError(deleted.error || "Cannot delete role.");
+        return;
+      }
 
       setSuccess("Role deleted successfully.");
       setSelectedRole("");
-      setPermissions({});
-      await loadRoles();
+      applyLoaded([rolesRes, { ok: true, result: modules }, matrixRes]);
+      refreshSession();
     } catch (err) {
-      setError(err.response?.data?.message || "Cannot delete role.");
+      setError(err.message || "Cannot delete role.");
     }
   };
 
   // ===============================
-  // TOGGLE PERMISSION
+  // TOGGLE PERMISSION (LOCAL UNTIL SAVED)
   // ===============================
-  const togglePermission = async (doctype, field) => {
+  const permissionsFor = (role) => {
+    const saved = matrix[role] || {};
+    const merged = {};
+
+    Object.keys(saved).forEach((dt) => {
+      merged[dt] = { ...saved[dt] };
+    });
+
+    Object.values(pending)
+      .filter((c) => c.role === role)
+      .forEach((c) => {
+        merged[c.doctype] = { ...(merged[c.doctype] || {}), ...c.values };
+      });
+
+    return merged;
+  };
+
+  const togglePermission = (doctype, field) => {
     if (!selectedRole || updating) return;
 
-    const current = permissions[doctype] || {};
+    const current = permissionsFor(selectedRole)[doctype] || {};
+    const key = `${selectedRole}::${doctype}`;
+
+    setPending((prev) => ({
+      ...prev,
+      [key]: {
+        role: selectedRole,
+        doctype,
+        values: {
+          ...(prev[key]?.values || {}),
+          [field]: current[field] ? 0 : 1,
+        },
+      },
+    }));
+  };
 
-    const updated = {
-      read: current.read ? 1 : 0,
-      write: current.write ? 1 : 0,
-      create: current.create ? 1 : 0,
-      delete: current.delete ? 1 : 0,
-      submit: current.submit ? 1 : 0,
-    };
+  // ===============================
+  // SAVE ALL CHANGES (ONE REQUEST)
+  // ===============================
+  const saveChanges = async () => {
+    const changes = Object.values(pending).map((c) => ({
+      role: c.role,
+      doctype: c.doctype,
+      ...c.values,
+    }));
 
-    updated[field] = updated[field] ? 0 : 1;
+    if (changes.length === 0 || updating) return;
 
     try {
       setUpdating(true);
+      setError("");
+      setSuccess("");
 
-      await frappe.post(
-        "/api/method/company_access_portal.api.role_api.update_doctype_permission",
-        {
-          role: selectedRole,
-          doctype,
-          ...updated,
-        }
-      );
-
-      await loadPermissions(selectedRole);
+      const [applied, matrixRes] = await batchCall([
+        api("role_api.apply_permission_changes", { changes }),
+        api("role_api.get_permission_matrix"),
+      ]);
+
+      if (!applied.ok) {
+        setError(applied.error || "Permission update failed.");
+        return;
+      }
+
+      setSuccess("Permissions updated successfully.");
+      if (matrixRes.ok) {
+        setMatrix(matrixRes.result?.matrix || {});
+        setPending({});
+      }
     } catch (err) {
       setError("Permission update failed.");
     } finally {
@@ -174,6 +197,9 @@ export default function Roles() {
     }
   };
 
+  const permissions = permissionsFor(selectedRole);
+  const pendingCount = Object.keys(pending).length;
+
   if (loading) return <div className="container">Loading...</div>;
 
   return (
@@ -229,6 +255,26 @@ export default function Roles() {
       </div>
 
       {/* ================= PERMISSIONS ================= */}
+      {pendingCount > 0 && (
+        <div className="card" style={{ marginTop: 30 }}>
+          <span>{pendingCount} unsaved change(s)</span>
+          <button
+            style={{ marginLeft: 10 }}
+            onClick={saveChanges}
+            disabled={updating}
+          >
+            {updating ? "Saving..." : "Save Changes"}
+          </button>
+          <button
+            style={{ marginLeft: 10 }}
+            onClick={() => setPending({})}
+            disabled={updating}
+          >
+            Discard
+          </button>
+        </div>
+      )}
+
       {selectedRole &&
         Object.keys(modules).map((module) => (
           <div key={module} className="card" style={{ marginTop: 30 }}>
@@ -245,7 +291,7 @@ export default function Roles() {
                       <label key={perm} style={{ marginLeft: 15 }}>
                         <input
                           type="checkbox"
-                          checked={p[perm] || false}
+                          checked={!!p[perm]}
                           disabled={updating}
                           onChange={() =>
                             togglePermission(dt, perm)
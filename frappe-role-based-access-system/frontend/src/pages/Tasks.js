@@ -3,11 +3,42 @@ import React, {
   useState,
   useContext,
   useCallback,
+  useRef,
 } from "react";
 import frappe from "../api/frappe";
+import { connectRealtime } from "../api/realtime";
 import { useNavigate } from "react-router-dom";
 import { AuthContext } from "../context/AuthContext";
 
+// ===============================
+// TASK DELTA SYNC
+// ===============================
+// The first call returns every visible task; later calls only return
+// rows changed since the saved cursor plus names of deleted tasks.
+const fetchChanges = async (since) => {
+  let changed = [];
+  let deleted = [];
+  let cursor = since;
+
+  for (;;) {
+    const params = new URLSearchParams({ limit: 500 });
+    if (cursor) params.set("since", cursor);
+
+    const res = await frappe.get(
+      `/api/method/company_access_portal.api.task_api.get_task_changes?${params}`
+    );
+    const data = res.data?.message;
+
+    if (data.reset) return fetchChanges(null);
+
+    changed = changed.concat(data.tasks);
+    deleted = deleted.concat(data.deleted);
+    cursor = data.cursor;
+
+    if (!data.has_more) return { changed, deleted, cursor, full: !since };
+  }
+};
+
 export default function Tasks() {
   const [tasks, setTasks] = useState([]);
   const [title, setTitle] = useState("");
@@ -16,48 +47,92 @@ export default function Tasks() {
   const [error, setError] = useState("");
   const [success, setSuccess] = useState("");
   const [submitting, setSubmitting] = useState(false);
+  const [capability, setCapability] = useState(null);
+  const [query, setQuery] = useState("");
+  const [searchResults, setSearchResults] = useState(null);
+  const syncCursor = useRef(null);
 
   const navigate = useNavigate();
-  const { user, logout } = useContext(AuthContext);
+  const { user, bootstrap, logout } = useContext(AuthContext);
 
   const roles = user?.roles || [];
 
-  const canCreate =
-    roles.includes("Company Admin") ||
-    roles.includes("Task Manager");
+  // ===============================
+  // CAPABILITIES (FROM BACKEND DOCPERM)
+  // ===============================
+  const loadCapabilities = useCallback(async () => {
+    const fromBootstrap = bootstrap?.capabilities?.doctypes?.["Company Task"];
+    if (fromBootstrap) {
+      setCapability({ bits: bootstrap.capabilities.bits, ...fromBootstrap });
+      return;
+    }
+
+    try {
+      const res = await frappe.get(
+        "/api/method/company_access_portal.api.permission_api.get_capabilities?doctype=Company Task"
+      );
+      const data = res.data?.message;
+      setCapability({
+        bits: data?.bits || {},
+        ...(data?.doctypes?.["Company Task"] || { mask: 0, owner_mask: 0 }),
+      });
+    } catch {
+      setCapability({ bits: {}, mask: 0, owner_mask: 0 });
+    }
+  }, [bootstrap]);
+
+  const can = (ptype, task) => {
+    if (!capability) return false;
+    const bit = capability.bits[ptype] || 0;
 
-  const canRead =
-    roles.includes("Company Admin") ||
-    roles.includes("Task Manager") ||
-    roles.includes("Task Viewer") ||
-    roles.includes("Reports Only");
+    if (capability.mask & bit) return true;
+    if (!(capability.owner_mask & bit)) return false;
+
+    if (!task || task.owner === user?.email) return true;
+
+    // assignees get the If Owner read / write rights (company_task.get_doc_mask)
+    return task.assigned_to === user?.email && (ptype === "read" || ptype === "write");
+  };
 
-  const canEdit = canCreate;
-  const canDelete = canCreate;
+  const capabilityLoaded = capability !== null;
+  const canCreate = can("create");
+  const canRead = can("read");
+  const canEdit = (task) => can("write", task);
+  const canDelete = (task) => can("delete", task);
 
   // ===============================
   // LOAD TASKS
   // ===============================
   const loadTasks = useCallback(async () => {
     try {
-      setLoading(true);
+      if (!syncCursor.current) setLoading(true);
       setError("");
 
-      const res = await frappe.get(
-        `/api/resource/Company Task?fields=["name","title","status"]`
-      );
+      const { changed, deleted, cursor, full } = await fetchChanges(syncCursor.current);
+
+      setTasks((prev) => {
+        const byName = new Map(full ? [] : prev.map((t) => [t.name, t]));
+        changed.forEach((t) => byName.set(t.name, t));
+        deleted.forEach((name) => byName.delete(name));
 
-      setTasks(res.data?.data || []);
+        return [...byName.values()].sort((a, b) =>
+          a.modified < b.modified ? 1 : a.modified > b.modified ? -1 : 0
+        );
+      });
+      syncCursor.current = cursor;
     } catch (err) {
       setError("Failed to load tasks.");
-      setTasks([]);
     } finally {
       setLoading(false);
     }
   }, []);
 
   useEffect(() => {
-    if (!user) return;
+    if (user) loadCapabilities();
+  }, [user, loadCapabilities]);
+
+  useEffect(() => {
+    if (!user || !capabilityLoaded) return;
 
     if (!canRead) {
       setError("You do not have permission to view tasks.");
@@ -65,8 +140,101 @@ export default function Tasks() {
       return;
     }
 
+    // seed from the bootstrap snapshot; the delta sync below then fetches
+    // its remaining pages and anything changed since it was cached
+    const snapshot = bootstrap?.tasks;
+    if (!syncCursor.current && snapshot?.cursor) {
+      setTasks(
+        [...snapshot.tasks].sort((a, b) =>
+          a.modified < b.modified ? 1 : a.modified > b.modified ? -1 : 0
+        )
+      );
+      syncCursor.current = snapshot.cursor;
+      setLoading(false);
+    }
+
     loadTasks();
-  }, [user, canRead, loadTasks]);
+  }, [user, capabilityLoaded, canRead, bootstrap, loadTasks]);
+
+  // ===============================
+  // REALTIME PUSH (NO POLLING)
+  // ===============================
+  // Pushed changes are applied in place; a reconnect re-runs the delta
+  // sync to pick up anything sent while the socket was down.
+  const applyPushedChanges = useCallback(({ changes = [] }) => {
+    setTasks((prev) => {
+      const byName = new Map(prev.map((t) => [t.name, t]));
+
+      changes.forEach((change) => {
+        if (change.action === "delete") {
+          byName.delete(change.name);
+        } else {
+          const { action, ...values } = change;
+          byName.set(change.name, { ...byName.get(change.name), ...values });
+        }
+      });
+
+      return [...byName.values()].sort((a, b) =>
+        a.modified < b.modified ? 1 : a.modified > b.modified ? -1 : 0
+      );
+    });
+  }, []);
+
+  useEffect(() => {
+    const config = bootstrap?.realtime;
+    if (!user || !canRead || !config) return;
+
+    let socket = null;
+    let cancelled = false;
+
+    connectRealtime(config)
+      .then((s) => {
+        if (cancelled) return;
+        socket = s;
+        socket.on(config.task_event, applyPushedChanges);
+        socket.io.on("reconnect", loadTasks);
+      })
+      .catch(() => {});
+
+    return () => {
+      cancelled = true;
+      if (socket) {
+        socket.off(config.task_event, applyPushedChanges);
+        socket.io.off("reconnect", loadTasks);
+      }
+    };
+  }, [user, canRead, bootstrap, applyPushedChanges, loadTasks]);
+
+  // ===============================
+  // SEARCH (SERVER-SIDE TOKEN INDEX)
+  // ===============================
+  useEffect(() => {
+    const q = query.trim();
+    if (!q) {
+      setSearchResults(null);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const res = await frappe.get(
+          "/api/method/company_access_portal.api.task_api.search_tasks",
+          { params: { q, limit: 50 } }
+        );
+        if (!cancelled) setSearchResults(res.data?.message?.tasks || []);
+      } catch {
+        if (!cancelled) setSearchResults([]);
+      }
+    }, 250);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [query, tasks]);
+
+  const visibleTasks = searchResults ?? tasks;
 
   // ===============================
   // CREATE / UPDATE
@@ -114,13 +282,13 @@ export default function Tasks() {
   // ===============================
   // DELETE
   // ===============================
-  const deleteTask = async (name) => {
-    if (!canDelete) return;
+  const deleteTask = async (task) => {
+    if (!canDelete(task)) return;
 
     if (!window.confirm("Delete this task?")) return;
 
     try {
-      await frappe.delete(`/api/resource/Company Task/${name}`);
+      await frappe.delete(`/api/resource/Company Task/${task.name}`);
       setSuccess("Task deleted.");
       await loadTasks();
     } catch {
@@ -200,14 +368,27 @@ export default function Tasks() {
       <div className="card" style={{ marginTop: 30 }}>
         <h2>All Tasks</h2>
 
+        <input
+          value={query}
+          placeholder="Search tasks"
+          onChange={(e) => setQuery(e.target.value)}
+        />
+
+        <a
+          style={{ marginLeft: 10 }}
+          href={`${frappe.defaults.baseURL}/api/method/company_access_portal.api.task_api.export_tasks?format=csv`}
+        >
+          Export CSV
+        </a>
+
         {loading && <p>Loading...</p>}
 
-        {!loading && tasks.length === 0 && (
-          <p>No tasks available.</p>
+        {!loading && visibleTasks.length === 0 && (
+          <p>{searchResults ? "No matching tasks." : "No tasks available."}</p>
         )}
 
         {!loading &&
-          tasks.map((task) => (
+          visibleTasks.map((task) => (
             <div
               key={task.name}
               style={{
@@ -225,7 +406,7 @@ export default function Tasks() {
               </div>
 
               <div>
-                {canEdit && (
+                {canEdit(task) && (
                   <button
                     onClick={() => {
                       setEditingTask(task.name);
@@ -236,10 +417,10 @@ export default function Tasks() {
                   </button>
                 )}
 
-                {canDelete && (
+                {canDelete(task) && (
                   <button
                     style={{ marginLeft: 10 }}
-                    onClick={() => deleteTask(task.name)}
+                    onClick={() => deleteTask(task)}
                   >
                     Delete
                   </button>